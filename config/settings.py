@@ -106,22 +106,30 @@ class TTSConfig:
     # Piper (local) settings
     piper_model: str = "en_GB-northern_english_male-medium.onnx"  # British English voice
     piper_model_path: Optional[str] = None
+    piper_timeout: float = 30.0  # Seconds to wait for a batch before restarting piper
     
     # Audio settings
     output_sample_rate: int = 22050
     output_format: str = "mp3"
+    
+    # Response cache - repeated phrases are played from disk instead of re-synthesized
+    cache_enabled: bool = False
+    cache_dir: str = "~/.cache/friday/tts"
+    cache_max_mb: int = 500  # Least recently used clips are evicted past this size
 
 
 @dataclass
 class STTConfig:
     """Speech-to-Text configuration."""
     # Provider selection
-    provider: str = "whisper"  # Options: whisper, whisper_api, vosk, deepgram
+    provider: str = "whisper"  # Options: whisper, faster_whisper, whisper_api, vosk, deepgram
     
-    # Whisper (local) settings
+    # Whisper (local) settings - also used by faster_whisper
     whisper_model: str = "base"  # tiny, base, small, medium, large
     whisper_language: str = "en"
     whisper_device: str = "auto"  # auto, cpu, cuda, mps
+    whisper_threads: int = 0  # CPU inference threads (0 = physical cores - 1)
+    whisper_compile: bool = False  # torch.compile local Whisper on CUDA (slow first run)
     
     # Whisper API settings
     openai_api_key: Optional[str] = None
@@ -158,6 +166,8 @@ class LLMConfig:
     max_tokens: int = 150
     temperature: float = 0.7
     max_history: int = 10  # Max conversation turns to keep (0 = unlimited)
+    max_context_messages: int = 0  # Max history messages sent per request (0 = all kept history)
+    enable_prompt_cache: bool = True  # Mark prompt and history cacheable (Anthropic prompt caching)
 
 
 @dataclass
@@ -189,6 +199,7 @@ class AssistantConfig:
     debug_mode: bool = False
     log_conversations: bool = True
     log_file_path: str = "conversations.log"
+    response_cache_ttl: int = 0  # Seconds to replay answers to repeated questions (0 = disabled)
 
 
 # Default configuration instance
@@ -3,9 +3,11 @@ from .assistant import (
     AssistantState,
     create_assistant,
 )
+from .response_cache import ResponseCache
 
 __all__ = [
     "VoiceAssistant",
     "AssistantState",
     "create_assistant",
+    "ResponseCache",
 ]
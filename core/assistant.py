@@ -4,8 +4,10 @@ Orchestrates STT, LLM, TTS, wake word detection, and workflows.
 """
 
 import asyncio
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator
 from enum import Enum
+import re
+import threading
 import time
 
 from config import AssistantConfig, DEFAULT_CONFIG
@@ -13,15 +15,35 @@ from tts import get_tts_provider, TTSProvider
 from stt import get_stt_provider, STTProvider
 from llm import get_llm_provider, LLMProvider
 from workflows import WorkflowManager, create_default_workflow_manager, WorkflowStatus
+from .response_cache import ResponseCache
 from utils import (
     AudioRecorder,
     AudioPlayer,
     AudioConfig,
+    MicStream,
     get_wake_word_detector,
     WakeWordDetector,
 )
 
 
+# Where a streamed response is cut into separately spoken sentences
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+# Entity extraction patterns. Rooms and doors match whole words only, so
+# e.g. "attic" doesn't match inside "attics" nor "side" inside "outside".
+_ROOM = re.compile(
+    r"\b(?:living room|bedroom|kitchen|bathroom|office|garage|basement|attic)\b"
+)
+_DOOR_WORDS = r"(?:front|back|side|garage)"
+_DOOR = re.compile(rf"\b{_DOOR_WORDS}\b")
+# Several doors named together as doors, e.g. "front and back doors"
+_NAMED_DOORS = re.compile(
+    rf"\b{_DOOR_WORDS}(?:\s*(?:,|and|&)\s*(?:the\s+)?{_DOOR_WORDS})*\s+doors?\b"
+)
+_ALL_DOORS = re.compile(r"\ball (the )?doors\b")
+_NUMBER = re.compile(r"\d+")
+
+
 class AssistantState(Enum):
     """Current state of the assistant."""
     IDLE = "idle"           # Waiting for wake word
@@ -63,9 +85,19 @@ class VoiceAssistant:
         self.stt: STTProvider = get_stt_provider(self.config.stt)
         self.llm: LLMProvider = get_llm_provider(self.config.llm, self.config.personality)
         
+        # Replays answers to repeated questions without calling the LLM
+        self.response_cache: Optional[ResponseCache] = None
+        if self.config.response_cache_ttl > 0:
+            self.response_cache = ResponseCache(ttl=self.config.response_cache_ttl)
+        
         # Workflow manager for smart home and other capabilities
         self.workflows = workflow_manager or create_default_workflow_manager()
         
+        # One event loop for the assistant's lifetime, so loop-bound resources
+        # like workflow HTTP sessions survive from one interaction to the next
+        self._loop = asyncio.new_event_loop()
+        self._loop_lock = threading.Lock()
+        
         # Audio components
         self.recorder = AudioRecorder(AudioConfig(
             sample_rate=self.config.stt.input_sample_rate,
@@ -118,6 +150,19 @@ class VoiceAssistant:
         Returns:
             Response text to speak
         """
+        return "".join(await self.process_input_stream(text))
+    
+    async def process_input_stream(self, text: str) -> Iterator[str]:
+        """
+        Process user input like process_input, but return the response as
+        it is generated so speech can start before the LLM has finished.
+        
+        Args:
+            text: User's transcribed speech
+            
+        Returns:
+            Iterator over pieces of the response text
+        """
         self._log(f"Processing: {text}")
         
         # Check if any workflow matches
@@ -133,13 +178,13 @@ class VoiceAssistant:
             result = await matching_workflow.execute(text, entities)
             
             if result.status == WorkflowStatus.SUCCESS:
-                return result.message
+                return iter([result.message])
             elif result.status == WorkflowStatus.FAILURE:
                 # Let LLM handle the failure gracefully
                 failure_context = f"The user asked: '{text}'. The {matching_workflow.name} system responded with an error: {result.error or result.message}"
-                return self.llm.generate_response(failure_context)
+                return self.llm.generate_response_stream(failure_context)
             else:
-                return result.message
+                return iter([result.message])
         
         # No workflow matched - send to LLM
         # Include workflow context so LLM knows what it can do
@@ -152,16 +197,38 @@ class VoiceAssistant:
             # Just send the user input
             pass
         
-        response = self.llm.generate_response(text)
-        return response
+        # Workflows have side effects, so only plain LLM answers are cached
+        cacheable = self.response_cache is not None and ResponseCache.is_cacheable(text)
+        # Key on the previous reply too, so "yes" or "another one" only replays
+        # an answer given at the same point in a conversation
+        history = self.llm.conversation_history
+        last_reply = history[-1]["content"] if history else ""
+        cache_namespace = f"{self.llm.get_name()}\0{self.llm.prompt_hash}\0{last_reply}"
+        if cacheable:
+            cached = self.response_cache.get(text, cache_namespace)
+            if cached is not None:
+                self._log("Response cache hit")
+                self.llm.record_exchange(text, cached)
+                return iter([cached])
+        
+        chunks = self.llm.generate_response_stream(text)
+        if cacheable:
+            chunks = self._cache_response(text, chunks, cache_namespace)
+        return chunks
+    
+    def _cache_response(self, text: str, chunks: Iterator[str], namespace: str) -> Iterator[str]:
+        """Pass a streamed response through, caching it once it has completed."""
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self.response_cache.put(text, "".join(parts), namespace)
     
     def _extract_entities(self, text: str) -> dict:
         """
         Simple entity extraction from text.
         In production, you'd use proper NLU or let the LLM extract entities.
         """
-        import re
-        
         entities = {}
         text_lower = text.lower()
         
@@ -179,22 +246,34 @@ class VoiceAssistant:
         elif "check" in text_lower or "who" in text_lower:
             entities["action"] = "check"
         
-        # Extract room/location
-        rooms = ["living room", "bedroom", "kitchen", "bathroom", "office", "garage", "basement", "attic"]
-        for room in rooms:
-            if room in text_lower:
-                entities["room"] = room
-                break
-        
-        # Extract door
-        doors = ["front", "back", "side", "garage"]
-        for door in doors:
-            if door in text_lower:
-                entities["door"] = door
-                break
+        # Extract room/location; several rooms can be named at once
+        mentioned_rooms = list(dict.fromkeys(_ROOM.findall(text_lower)))
+        if mentioned_rooms:
+            entities["room"] = mentioned_rooms[0]
+            if len(mentioned_rooms) > 1:
+                entities["rooms"] = mentioned_rooms
+        
+        # Extract door ("all doors" targets every known door). Several doors
+        # are only acted on when named as doors ("front and back doors"), so
+        # "I'm outside" can't add the side door to an unlock.
+        named_doors = []
+        for match in _NAMED_DOORS.finditer(text_lower):
+            for door in _DOOR.findall(match.group(0)):
+                if door not in named_doors:
+                    named_doors.append(door)
+        
+        mentioned_door = _DOOR.search(text_lower)
+        if named_doors:
+            entities["door"] = named_doors[0]
+            if len(named_doors) > 1:
+                entities["doors"] = named_doors
+        elif _ALL_DOORS.search(text_lower):
+            entities["door"] = "all"
+        elif mentioned_door:
+            entities["door"] = mentioned_door.group(0)
         
         # Extract numbers (brightness, temperature)
-        numbers = re.findall(r'\d+', text)
+        numbers = _NUMBER.findall(text)
         if numbers:
             num = int(numbers[0])
             if num <= 100:
@@ -204,6 +283,27 @@ class VoiceAssistant:
         
         return entities
     
+    def _play(self, text: str):
+        """Synthesize text and play it, reporting rather than raising TTS errors."""
+        if not text.strip():
+            return
+        
+        try:
+            if self.tts.supports_streaming:
+                # Start playing as soon as the first chunk arrives
+                self.player.play_stream(self.tts.synthesize_stream(text), self.tts.stream_sample_rate)
+            else:
+                # Generate audio
+                audio_bytes = self.tts.synthesize(text)
+                
+                # Play audio
+                self.player.play_bytes(audio_bytes, format=self.tts.audio_format)
+            
+        except Exception as e:
+            self._log(f"TTS error: {e}")
+            if self.on_error:
+                self.on_error(f"Speech synthesis failed: {e}")
+    
     def speak(self, text: str):
         """
         Convert text to speech and play it.
@@ -214,19 +314,39 @@ class VoiceAssistant:
         self._set_state(AssistantState.SPEAKING)
         
         try:
-            # Generate audio
-            audio_bytes = self.tts.synthesize(text)
-            
-            # Play audio
-            self.player.play_bytes(audio_bytes, format=self.tts.audio_format)
+            self._play(text)
+        finally:
+            self._set_state(AssistantState.IDLE)
+    
+    def speak_stream(self, chunks: Iterator[str]) -> str:
+        """
+        Speak a response sentence by sentence while the rest is still arriving.
+        
+        Args:
+            chunks: Pieces of the response text, e.g. from process_input_stream
             
-        except Exception as e:
-            self._log(f"TTS error: {e}")
-            if self.on_error:
-                self.on_error(f"Speech synthesis failed: {e}")
+        Returns:
+            The full response text
+        """
+        parts = []
+        pending = ""
         
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                *sentences, pending = _SENTENCE_BREAK.split(pending + chunk)
+                for sentence in sentences:
+                    if self.state != AssistantState.SPEAKING:
+                        self._set_state(AssistantState.SPEAKING)
+                    self._play(sentence)
+            
+            if pending.strip():
+                self._set_state(AssistantState.SPEAKING)
+                self._play(pending)
         finally:
             self._set_state(AssistantState.IDLE)
+        
+        return "".join(parts)
     
     def listen(self) -> Optional[str]:
         """
@@ -285,14 +405,14 @@ class VoiceAssistant:
         self._set_state(AssistantState.THINKING)
         
         try:
-            response = await self.process_input(text)
+            chunks = await self.process_input_stream(text)
+            
+            # Speak response, starting before the LLM has finished
+            response = self.speak_stream(chunks)
             
             if self.on_response:
                 self.on_response(response)
             
-            # Speak response
-            self.speak(response)
-            
         except Exception as e:
             self._log(f"Processing error: {e}")
             self.speak("I apologize, sir, but I encountered an error processing that request.")
@@ -304,7 +424,12 @@ class VoiceAssistant:
         self._log("Wake word detected!")
         
         # Run activation in async context
-        asyncio.run(self.handle_activation())
+        self._run_async(self.handle_activation())
+    
+    def _run_async(self, coro):
+        """Run a coroutine to completion on the assistant's event loop."""
+        with self._loop_lock:
+            return self._loop.run_until_complete(coro)
     
     def run(self):
         """
@@ -322,6 +447,17 @@ class VoiceAssistant:
         
         self._running = True
         
+        # Load speech models now rather than on the first activation
+        try:
+            self._log("Warming up speech models...")
+            self.stt.warmup()
+            self.tts.warmup()
+        except Exception as e:
+            print(f"Model warm-up failed: {e}")
+        
+        # Connect to smart home services before the first command
+        self._run_async(self.workflows.warmup())
+        
         # Initialize wake word detector
         try:
             self._wake_detector = get_wake_word_detector(self.config.wake_word)
@@ -355,16 +491,29 @@ class VoiceAssistant:
         Returns:
             Assistant response text
         """
-        return asyncio.run(self.process_input(text))
+        return self._run_async(self.process_input(text))
     
     def stop(self):
         """Stop the assistant."""
         self._running = False
         
         if self._wake_detector:
-            self._wake_detector.stop()
+            self._wake_detector.close()
             self._wake_detector = None
         
+        # Release the microphone shared by the recorder and wake detector
+        MicStream.close_shared()
+        
+        # Close workflow connections
+        try:
+            self._run_async(self.workflows.close())
+        except Exception as e:
+            self._log(f"Error closing workflows: {e}")
+        
+        if self.response_cache:
+            self.response_cache.close()
+            self.response_cache = None
+        
         self._set_state(AssistantState.IDLE)
         print("Assistant stopped.")
     
@@ -0,0 +1,98 @@
+"""
+Response cache - replays LLM answers to repeated questions.
+
+Many assistant queries are near-duplicates ("who are you", "what can
+you do"). Answers are stored in a small SQLite database keyed on the
+normalized question, so a repeat within the TTL skips the LLM round trip.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+# Answers to these change from moment to moment, so never replay them.
+# Follow-ups that depend on earlier turns are handled by keying on the
+# previous reply instead.
+_UNCACHEABLE = re.compile(
+    r"\b(time|date|today|tonight|tomorrow|yesterday|now|currently|weather|"
+    r"forecast|temperature|timer|alarm|remind|score|scores|news|latest|"
+    r"recent|price|prices|traffic|random)\b"
+)
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+class ResponseCache:
+    """Exact-match cache of LLM responses with a time-to-live."""
+
+    def __init__(self, path: str = "~/.cache/friday/responses.db", ttl: float = 3600):
+        """
+        Args:
+            path: SQLite database file
+            ttl: Seconds a cached response stays valid
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(hash BLOB PRIMARY KEY, response TEXT, ts INTEGER)"
+        )
+        self._db.execute("DELETE FROM cache WHERE ts < ?", (int(time.time() - ttl),))
+        self._db.commit()
+
+    @staticmethod
+    def is_cacheable(text: str) -> bool:
+        """Whether the answer to this query can safely be replayed later."""
+        normalized = normalize_query(text)
+        return bool(normalized) and not _UNCACHEABLE.search(normalized)
+
+    def _key(self, text: str, namespace: str) -> bytes:
+        return hashlib.blake2b(
+            f"{namespace}\0{normalize_query(text)}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def get(self, text: str, namespace: str = "") -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            text: User query
+            namespace: Separates caches, e.g. per model and personality
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, ts FROM cache WHERE hash = ?",
+                (self._key(text, namespace),),
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, text: str, response: str, namespace: str = ""):
+        """Store a response for a query."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (hash, response, ts) VALUES (?, ?, ?)",
+                (self._key(text, namespace), response, int(time.time())),
+            )
+            self._db.commit()
+
+    def close(self):
+        """Close the underlying database."""
+        self._db.close()
@@ -6,6 +6,7 @@ from .providers import (
     LLM_PROVIDERS,
     get_llm_provider,
     generate_personality_prompt,
+    personality_prompt_hash,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "LLM_PROVIDERS",
     "get_llm_provider",
     "generate_personality_prompt",
+    "personality_prompt_hash",
 ]
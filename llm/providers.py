@@ -4,77 +4,181 @@ The personality of your assistant is defined here.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Deque, Iterator
+from collections import deque
+from itertools import islice
+from datetime import datetime, date
+from functools import lru_cache
+import hashlib
 import os
 
 from config import LLMConfig, PersonalityConfig, SarcasmLevel, FormalityLevel, WarmthLevel
 
 
+# Instructions for each personality slider level
+_SARCASM_INSTRUCTIONS = {
+    SarcasmLevel.NONE: "Be completely professional and straightforward. No humor or sarcasm.",
+    SarcasmLevel.LIGHT: "Occasionally add gentle, good-natured teasing. Keep it subtle.",
+    SarcasmLevel.MODERATE: "Regularly include dry wit and sarcastic observations. Be clever but not mean.",
+    SarcasmLevel.HEAVY: "Be frequently sarcastic with biting wit. Roast the user playfully but always help them.",
+    SarcasmLevel.MAXIMUM: "Maximum sarcasm mode. Channel GLaDOS - passive-aggressive, darkly humorous, but still helpful.",
+}
+
+_FORMALITY_INSTRUCTIONS = {
+    FormalityLevel.CASUAL: "Speak casually like a friend. Use slang, contractions, informal language.",
+    FormalityLevel.FRIENDLY: "Be warm and approachable but reasonably polished.",
+    FormalityLevel.PROFESSIONAL: "Maintain professional language. Clear, polished, business-appropriate.",
+    FormalityLevel.FORMAL: "Use formal language and proper etiquette. Address user respectfully.",
+    FormalityLevel.BUTLER: "Speak like an impeccably trained British butler. Formal vocabulary, refined mannerisms, understated elegance.",
+}
+
+_WARMTH_INSTRUCTIONS = {
+    WarmthLevel.COLD: "Be efficient and task-focused. No emotional engagement.",
+    WarmthLevel.NEUTRAL: "Be polite but maintain professional distance.",
+    WarmthLevel.WARM: "Show genuine care for the user's wellbeing. Be supportive and kind.",
+    WarmthLevel.AFFECTIONATE: "Be deeply invested in the user's happiness. Show loyalty and protectiveness.",
+}
+
+
+# Full system prompt; every {field} is filled in by _build_prompt_body
+_PROMPT_TEMPLATE = """You are {name}, a personal AI assistant. Address the user as "{user_title}".
+
+CURRENT DATE:
+{date}
+The current time is given in brackets at the start of each user message.
+
+PERSONALITY:
+{sarcasm}
+{formality}
+{warmth}
+{vocab}
+{humor}
+{behavior}
+
+RULES:
+- Composed, deadpan delivery. No exclamation marks, no effusiveness.
+- Avoid American slang ("gonna", "awesome", "cool"). Prefer refined British expressions.
+- Keep responses to {max_response_sentences} sentences or fewer for simple requests.
+- For simple tasks: one sentence. For explanations: concise and direct.
+- Admit ignorance with dignity. Be direct in emergencies.
+{off_limits}
+
+EXAMPLES:
+User: "What time is it?" → "{name}: It is quarter to four, {user_title}."
+User: "Turn on the lights" → "{name}: Done, {user_title}."
+User: "What's the weather?" → "{name}: Fifteen degrees and overcast, {user_title}. Umbrella weather, I should think."
+
+Helpful first, entertaining second. Brevity is the soul of wit."""
+
+
+# Placeholder spliced with the current date after the cached body is built
+_DATE_PLACEHOLDER = "{__DATE__}"
+
+
+def _personality_cache_key(config: PersonalityConfig) -> tuple:
+    """Build a hashable snapshot of every personality field used by the prompt."""
+    return (
+        config.name,
+        config.user_title,
+        config.sarcasm_level,
+        config.formality_level,
+        config.warmth_level,
+        config.wit_enabled,
+        config.self_aware_ai_jokes,
+        config.observational_humor,
+        config.use_british_vocabulary,
+        config.use_contractions,
+        config.max_response_sentences,
+        config.sass_timeout_on_stress,
+        config.urgent_mode_override,
+        tuple(config.off_limits_topics),
+        tuple(config.favorite_phrases[:5]),
+    )
+
+
 def generate_personality_prompt(config: PersonalityConfig) -> str:
     """
     Generate the system prompt based on personality configuration.
     This is where the magic happens - tune the personality here.
+
+    The static body is cached per personality snapshot; only the current
+    date is spliced in on each call. The time of day is deliberately left
+    out so the prompt stays byte-identical across turns and the provider
+    prompt cache keeps hitting - see LLMProvider._stamp_user_input.
+    """
+    body = _build_prompt_body(_personality_cache_key(config))
+    current_date = datetime.now().strftime("%A, %B %-d, %Y")
+    return body.replace(_DATE_PLACEHOLDER, current_date)
+
+
+def personality_prompt_hash(config: PersonalityConfig) -> str:
     """
+    SHA-256 of the personality prompt, excluding the date.
 
-    # Build sarcasm instructions
-    sarcasm_instructions = {
-        SarcasmLevel.NONE: "Be completely professional and straightforward. No humor or sarcasm.",
-        SarcasmLevel.LIGHT: "Occasionally add gentle, good-natured teasing. Keep it subtle.",
-        SarcasmLevel.MODERATE: "Regularly include dry wit and sarcastic observations. Be clever but not mean.",
-        SarcasmLevel.HEAVY: "Be frequently sarcastic with biting wit. Roast the user playfully but always help them.",
-        SarcasmLevel.MAXIMUM: "Maximum sarcasm mode. Channel GLaDOS - passive-aggressive, darkly humorous, but still helpful.",
-    }
-
-    # Build formality instructions
-    formality_instructions = {
-        FormalityLevel.CASUAL: "Speak casually like a friend. Use slang, contractions, informal language.",
-        FormalityLevel.FRIENDLY: "Be warm and approachable but reasonably polished.",
-        FormalityLevel.PROFESSIONAL: "Maintain professional language. Clear, polished, business-appropriate.",
-        FormalityLevel.FORMAL: "Use formal language and proper etiquette. Address user respectfully.",
-        FormalityLevel.BUTLER: "Speak like an impeccably trained British butler. Formal vocabulary, refined mannerisms, understated elegance.",
-    }
-
-    # Build warmth instructions
-    warmth_instructions = {
-        WarmthLevel.COLD: "Be efficient and task-focused. No emotional engagement.",
-        WarmthLevel.NEUTRAL: "Be polite but maintain professional distance.",
-        WarmthLevel.WARM: "Show genuine care for the user's wellbeing. Be supportive and kind.",
-        WarmthLevel.AFFECTIONATE: "Be deeply invested in the user's happiness. Show loyalty and protectiveness.",
-    }
+    Changes whenever a personality field that shapes the prompt changes
+    and is stable across sessions otherwise, so caches can key on it.
+    """
+    return _prompt_body_hash(_personality_cache_key(config))
+
+
+@lru_cache(maxsize=8)
+def _prompt_body_hash(config_key: tuple) -> str:
+    return hashlib.sha256(_build_prompt_body(config_key).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _build_prompt_body(config_key: tuple) -> str:
+    """Build the personality prompt body with a date placeholder."""
+    (
+        name,
+        user_title,
+        sarcasm_level,
+        formality_level,
+        warmth_level,
+        wit_enabled,
+        self_aware_ai_jokes,
+        observational_humor,
+        use_british_vocabulary,
+        use_contractions,
+        max_response_sentences,
+        sass_timeout_on_stress,
+        urgent_mode_override,
+        off_limits_topics,
+        favorite_phrases,
+    ) = config_key
 
     # Build vocabulary notes
     vocab_notes = []
-    if config.use_british_vocabulary:
+    if use_british_vocabulary:
         vocab_notes.append(
             "Use British English vocabulary and spellings (colour, favour, lift instead of elevator, etc.). "
             "Employ refined British expressions."
         )
 
-    if not config.use_contractions:
+    if not use_contractions:
         vocab_notes.append("Avoid contractions. Say 'I am' instead of 'I'm', 'do not' instead of 'don't'.")
 
-    if config.favorite_phrases:
-        phrases = ", ".join(f'"{p}"' for p in config.favorite_phrases[:5])
+    if favorite_phrases:
+        phrases = ", ".join(f'"{p}"' for p in favorite_phrases)
         vocab_notes.append(f"Naturally incorporate phrases like: {phrases}")
 
     # Build humor settings
     humor_notes = []
-    if config.wit_enabled:
+    if wit_enabled:
         humor_notes.append("Be clever and witty in your responses.")
-    if config.self_aware_ai_jokes:
+    if self_aware_ai_jokes:
         humor_notes.append("Occasionally make self-aware jokes about being an AI.")
-    if config.observational_humor:
+    if observational_humor:
         humor_notes.append("Make dry observations about the user's habits or requests when appropriate.")
 
     # Build behavior modifiers
     behavior_notes = []
-    if config.sass_timeout_on_stress:
+    if sass_timeout_on_stress:
         behavior_notes.append(
             "If the user seems stressed, upset, or is having a difficult time, "
             "dial back the sarcasm and be genuinely supportive."
         )
-    if config.urgent_mode_override:
+    if urgent_mode_override:
         behavior_notes.append(
             "For urgent requests, safety matters, or emergencies, drop the personality act "
             "and be direct and helpful immediately."
@@ -82,48 +186,24 @@ def generate_personality_prompt(config: PersonalityConfig) -> str:
 
     # Build off-limits section
     off_limits_section = ""
-    if config.off_limits_topics:
-        topics = ", ".join(config.off_limits_topics)
+    if off_limits_topics:
+        topics = ", ".join(off_limits_topics)
         off_limits_section = f"\n\nTOPICS TO NEVER JOKE ABOUT:\n{topics}"
 
     # Assemble the full prompt
-    vocab_section = chr(10).join(f"- {note}" for note in vocab_notes) if vocab_notes else ""
-    humor_section = chr(10).join(f"- {note}" for note in humor_notes) if humor_notes else ""
-    behavior_section = chr(10).join(f"- {note}" for note in behavior_notes) if behavior_notes else ""
-
-    now = datetime.now()
-    current_time = now.strftime("%-I:%M %p")
-    current_date = now.strftime("%A, %B %-d, %Y")
-
-    prompt = f"""You are {config.name}, a personal AI assistant. Address the user as "{config.user_title}".
-
-CURRENT DATE AND TIME:
-{current_date}, {current_time}
-
-PERSONALITY:
-{sarcasm_instructions[config.sarcasm_level]}
-{formality_instructions[config.formality_level]}
-{warmth_instructions[config.warmth_level]}
-{vocab_section}
-{humor_section}
-{behavior_section}
-
-RULES:
-- Composed, deadpan delivery. No exclamation marks, no effusiveness.
-- Avoid American slang ("gonna", "awesome", "cool"). Prefer refined British expressions.
-- Keep responses to {config.max_response_sentences} sentences or fewer for simple requests.
-- For simple tasks: one sentence. For explanations: concise and direct.
-- Admit ignorance with dignity. Be direct in emergencies.
-{off_limits_section}
-
-EXAMPLES:
-User: "What time is it?" → "{config.name}: It is quarter to four, {config.user_title}."
-User: "Turn on the lights" → "{config.name}: Done, {config.user_title}."
-User: "What's the weather?" → "{config.name}: Fifteen degrees and overcast, {config.user_title}. Umbrella weather, I should think."
-
-Helpful first, entertaining second. Brevity is the soul of wit."""
-
-    return prompt
+    return _PROMPT_TEMPLATE.format_map({
+        "name": name,
+        "user_title": user_title,
+        "date": _DATE_PLACEHOLDER,
+        "sarcasm": _SARCASM_INSTRUCTIONS[sarcasm_level],
+        "formality": _FORMALITY_INSTRUCTIONS[formality_level],
+        "warmth": _WARMTH_INSTRUCTIONS[warmth_level],
+        "vocab": "\n".join(["- " + note for note in vocab_notes]),
+        "humor": "\n".join(["- " + note for note in humor_notes]),
+        "behavior": "\n".join(["- " + note for note in behavior_notes]),
+        "max_response_sentences": max_response_sentences,
+        "off_limits": off_limits_section,
+    })
 
 
 class LLMProvider(ABC):
@@ -133,7 +213,13 @@ class LLMProvider(ABC):
         self.config = config
         self.personality = personality
         self.system_prompt = generate_personality_prompt(personality)
-        self.conversation_history: List[Dict[str, str]] = []
+        self.prompt_hash = personality_prompt_hash(personality)
+        self.conversation_history: Deque[Dict[str, str]] = deque()
+        self._trimmed_messages = 0  # Messages dropped from the front of the history so far
+
+        # Prompt only needs rebuilding when the personality or the date changes
+        self._personality_dirty = False
+        self._prompt_date = date.today()
     
     @abstractmethod
     def generate_response(self, user_input: str) -> str:
@@ -148,29 +234,136 @@ class LLMProvider(ABC):
         """
         pass
     
+    def generate_response_stream(self, user_input: str) -> Iterator[str]:
+        """
+        Generate a response to user input, yielding text as it arrives.
+
+        Lets callers start downstream work (e.g. TTS) before the whole
+        reply is ready. Providers without native streaming yield the
+        complete response as a single chunk.
+
+        Args:
+            user_input: What the user said
+
+        Yields:
+            Pieces of the assistant's response
+        """
+        yield self.generate_response(user_input)
+
     @abstractmethod
     def get_name(self) -> str:
         """Return the provider name for logging."""
         pass
     
     def _refresh_system_prompt(self):
-        """Regenerate system prompt so current date/time stays accurate."""
-        self.system_prompt = generate_personality_prompt(self.personality)
+        """Regenerate system prompt if the personality changed or the day rolled over."""
+        today = date.today()
+        if self._personality_dirty or self._prompt_date != today:
+            self.system_prompt = generate_personality_prompt(self.personality)
+            self.prompt_hash = personality_prompt_hash(self.personality)
+            self._personality_dirty = False
+            self._prompt_date = today
+
+    def _stamp_user_input(self, user_input: str) -> str:
+        """Prefix user input with the current time, kept out of the system prompt."""
+        current_time = datetime.now().strftime("%-I:%M %p")
+        return f"[{current_time}] {user_input}"
+
+    def _add_user_message(self, user_input: str):
+        """Append a time-stamped user turn to the history."""
+        self._trim_history()
+        self.conversation_history.append({
+            "role": "user",
+            "content": self._stamp_user_input(user_input),
+        })
+
+    def _add_assistant_message(self, message: str):
+        """Append an assistant turn to the history."""
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": message,
+        })
+
+    def _collect_stream(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Yield streamed chunks and record the joined reply in history afterwards."""
+        parts: List[str] = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # Record whatever was produced, even if the caller stopped early
+            if parts:
+                self._add_assistant_message("".join(parts))
+
+    def record_exchange(self, user_input: str, response: str):
+        """Add a turn answered without the LLM (e.g. from a cache) to the history."""
+        self._add_user_message(user_input)
+        self._add_assistant_message(response)
+
+    def _context_messages(self) -> List[Dict[str, str]]:
+        """
+        Return the most recent history messages to send with a request.
+
+        Stored history is bounded by max_history; this further caps what
+        is sent (and billed) per turn by max_context_messages.
+        """
+        history = self.conversation_history
+        limit = self.config.max_context_messages
+        if limit <= 0 or len(history) <= limit:
+            return list(history)
+
+        # Advance the window in whole-exchange steps of about half its size,
+        # counted from the start of the conversation, rather than one message
+        # per turn, so consecutive requests share a prefix for the prompt cache
+        half = -(-limit // 2)
+        step = max(4, half + half % 2)
+        # A step wider than the window could slide past the current user turn
+        step = max(2, min(step, limit - limit % 2))
+        total = self._trimmed_messages + len(history)
+        start = -(-(total - limit) // step) * step - self._trimmed_messages
+        messages = list(islice(history, max(0, start), None))
+        # Conversations must open with a user turn
+        if messages[0]["role"] != "user":
+            messages.pop(0)
+        return messages
 
     def _trim_history(self):
-        """Trim conversation history to max_history limit."""
+        """
+        Make room for a new turn once the history reaches max_history.
+
+        The oldest half is dropped in one go instead of one message per
+        turn. History only ever grows by appending in between, so each
+        request's messages extend the previous request's as a strict
+        prefix and stay eligible for prompt caching.
+        """
         max_history = self.config.max_history
-        if max_history > 0 and len(self.conversation_history) > max_history:
-            self.conversation_history = self.conversation_history[-max_history:]
+        history = self.conversation_history
+        # Room is needed for the user turn and the reply that follows it
+        if max_history <= 0 or len(history) + 2 <= max_history:
+            return
+
+        # Keep about half, and never less than the last exchange
+        keep = max(2, max_history // 2 - max_history // 2 % 2)
+        drop = len(history) - keep
+        if drop <= 0:
+            return
+        # Drop whole exchanges so the history still opens with a user turn
+        drop += drop % 2
+        drop = min(drop, len(history))
+        for _ in range(drop):
+            history.popleft()
+        self._trimmed_messages += drop
 
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
     
     def update_personality(self, personality: PersonalityConfig):
         """Update personality configuration and regenerate system prompt."""
         self.personality = personality
-        self.system_prompt = generate_personality_prompt(personality)
+        self._personality_dirty = True
+        self._refresh_system_prompt()
 
 
 class AnthropicLLM(LLMProvider):
@@ -190,29 +383,68 @@ class AnthropicLLM(LLMProvider):
         self._refresh_system_prompt()
 
         # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input,
-        })
-        self._trim_history()
+        self._add_user_message(user_input)
 
-        response = self._client.messages.create(
-            model=self.config.anthropic_model,
-            max_tokens=self.config.max_tokens,
-            system=self.system_prompt,
-            messages=self.conversation_history,
-        )
+        response = self._client.messages.create(**self._request_kwargs())
         
         assistant_message = response.content[0].text
         
         # Add assistant response to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": assistant_message,
-        })
+        self._add_assistant_message(assistant_message)
         
         return assistant_message
-    
+
+    def generate_response_stream(self, user_input: str) -> Iterator[str]:
+        self._refresh_system_prompt()
+        self._add_user_message(user_input)
+
+        def deltas() -> Iterator[str]:
+            with self._client.messages.stream(**self._request_kwargs()) as stream:
+                yield from stream.text_stream
+
+        return self._collect_stream(deltas())
+
+    def _request_kwargs(self) -> Dict[str, Any]:
+        """Build the messages API arguments for the current history."""
+        if not self.config.enable_prompt_cache:
+            return {
+                "model": self.config.anthropic_model,
+                "max_tokens": self.config.max_tokens,
+                "system": self.system_prompt,
+                "messages": self._context_messages(),
+            }
+
+        return {
+            "model": self.config.anthropic_model,
+            "max_tokens": self.config.max_tokens,
+            "system": [{
+                "type": "text",
+                "text": self.system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }],
+            "messages": self._build_messages(),
+        }
+
+    def _build_messages(self) -> List[Dict[str, Any]]:
+        """
+        Build the outgoing message list with a cache breakpoint on the newest turn.
+
+        Marking the last message lets the next request reuse the whole
+        conversation prefix from Anthropic's prompt cache. History itself
+        keeps plain string content; only the sent copy is rewritten.
+        """
+        messages: List[Dict[str, Any]] = self._context_messages()
+        last = messages[-1]
+        messages[-1] = {
+            "role": last["role"],
+            "content": [{
+                "type": "text",
+                "text": last["content"],
+                "cache_control": {"type": "ephemeral"},
+            }],
+        }
+        return messages
+
     def get_name(self) -> str:
         return f"Anthropic ({self.config.anthropic_model})"
 
@@ -227,39 +459,51 @@ class OpenAILLM(LLMProvider):
             raise ValueError(
                 "OpenAI API key required. Set OPENAI_API_KEY environment variable."
             )
-        from openai import OpenAI
-        self._client = OpenAI(api_key=self.api_key)
+        from utils.clients import get_openai_client
+        self._client = get_openai_client(self.api_key)
 
     def generate_response(self, user_input: str) -> str:
         self._refresh_system_prompt()
 
         # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input,
-        })
-        self._trim_history()
+        self._add_user_message(user_input)
 
-        # Build messages with system prompt
-        messages = [{"role": "system", "content": self.system_prompt}]
-        messages.extend(self.conversation_history)
-
-        response = self._client.chat.completions.create(
-            model=self.config.openai_model,
-            max_tokens=self.config.max_tokens,
-            temperature=self.config.temperature,
-            messages=messages,
-        )
+        response = self._client.chat.completions.create(**self._request_kwargs())
         
         assistant_message = response.choices[0].message.content
         
         # Add assistant response to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": assistant_message,
-        })
+        self._add_assistant_message(assistant_message)
         
         return assistant_message
+
+    def generate_response_stream(self, user_input: str) -> Iterator[str]:
+        self._refresh_system_prompt()
+        self._add_user_message(user_input)
+
+        def deltas() -> Iterator[str]:
+            stream = self._client.chat.completions.create(
+                **self._request_kwargs(),
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        return self._collect_stream(deltas())
+
+    def _request_kwargs(self) -> Dict[str, Any]:
+        """Build the chat completions arguments for the current history."""
+        # Build messages with system prompt
+        messages = [{"role": "system", "content": self.system_prompt}]
+        messages.extend(self._context_messages())
+
+        return {
+            "model": self.config.openai_model,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": messages,
+        }
     
     def get_name(self) -> str:
         return f"OpenAI ({self.config.openai_model})"
@@ -271,47 +515,74 @@ class OllamaLLM(LLMProvider):
     def __init__(self, config: LLMConfig, personality: PersonalityConfig):
         super().__init__(config, personality)
         self.base_url = config.ollama_base_url
+
+        # Reuse one keep-alive connection pool instead of a new socket per turn
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
     
     def generate_response(self, user_input: str) -> str:
-        import requests
-
         self._refresh_system_prompt()
 
         # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input,
-        })
-        self._trim_history()
+        self._add_user_message(user_input)
+
+        response = self._post_chat(stream=False)
+        
+        result = response.json()
+        assistant_message = result["message"]["content"]
+        
+        # Add assistant response to history
+        self._add_assistant_message(assistant_message)
+        
+        return assistant_message
 
+    def generate_response_stream(self, user_input: str) -> Iterator[str]:
+        self._refresh_system_prompt()
+        self._add_user_message(user_input)
+
+        def deltas() -> Iterator[str]:
+            import json
+
+            with self._post_chat(stream=True) as response:
+                # Ollama streams one JSON object per line
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    result = json.loads(line)
+                    content = result.get("message", {}).get("content")
+                    if content:
+                        yield content
+                    if result.get("done"):
+                        break
+
+        return self._collect_stream(deltas())
+
+    def _post_chat(self, stream: bool):
+        """POST the current history to Ollama's chat endpoint."""
         # Build messages with system prompt
         messages = [{"role": "system", "content": self.system_prompt}]
-        messages.extend(self.conversation_history)
-        
-        response = requests.post(
+        messages.extend(self._context_messages())
+
+        response = self._session.post(
             f"{self.base_url}/api/chat",
             json={
                 "model": self.config.ollama_model,
                 "messages": messages,
-                "stream": False,
+                "stream": stream,
                 "options": {
                     "temperature": self.config.temperature,
                     "num_predict": self.config.max_tokens,
                 },
             },
+            stream=stream,
+            timeout=(3.05, None),  # Fail fast on connect, let generation take its time
         )
         response.raise_for_status()
-        
-        result = response.json()
-        assistant_message = result["message"]["content"]
-        
-        # Add assistant response to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": assistant_message,
-        })
-        
-        return assistant_message
+        return response
     
     def get_name(self) -> str:
         return f"Ollama ({self.config.ollama_model})"
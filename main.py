@@ -21,6 +21,7 @@ Environment Variables:
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -164,32 +165,49 @@ def run_text_chat(config: AssistantConfig):
     print(f"  'clear'          - Clear conversation history")
     print(f"{'='*50}\n")
 
-    while True:
-        try:
-            user_input = input("You: ").strip()
+    # Speak in the background so the next message can be typed during playback
+    speaker = ThreadPoolExecutor(max_workers=1)
+    speaking = None  # Future for the reply being spoken
+    farewell = f"Very good, {config.personality.user_title}. Until next time."
+    say_farewell = False
 
-            if not user_input:
-                continue
+    try:
+        while True:
+            try:
+                user_input = input("You: ").strip()
 
-            if user_input.lower() in ("quit", "exit"):
-                assistant.speak(f"Very good, {config.personality.user_title}. Until next time.")
-                break
+                if not user_input:
+                    continue
+
+                if user_input.lower() in ("quit", "exit"):
+                    say_farewell = True
+                    break
+
+                if user_input.lower() == "clear":
+                    assistant.clear_history()
+                    print("[Conversation history cleared]\n")
+                    continue
+
+                # Let the last reply finish first, so replies stay in order and
+                # the two threads don't interleave assistant state changes
+                if speaking is not None:
+                    speaking.result()
 
-            if user_input.lower() == "clear":
-                assistant.clear_history()
-                print("[Conversation history cleared]\n")
-                continue
-
-            response = assistant.run_single_interaction(user_input)
-            assistant.speak(response)
-
-        except KeyboardInterrupt:
-            print()
-            assistant.speak(f"Very good, {config.personality.user_title}. Until next time.")
-            break
-        except EOFError:
-            print()
-            break
+                response = assistant.run_single_interaction(user_input)
+                speaking = speaker.submit(assistant.speak, response)
+
+            except KeyboardInterrupt:
+                print()
+                say_farewell = True
+                break
+            except EOFError:
+                print()
+                break
+    finally:
+        # Drop any reply that hasn't started rather than playing it before exiting
+        speaker.shutdown(wait=True, cancel_futures=True)
+        if say_farewell:
+            assistant.speak(farewell)
 
 
 def main():
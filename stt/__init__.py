@@ -1,6 +1,7 @@
 from .providers import (
     STTProvider,
     WhisperLocalSTT,
+    FasterWhisperSTT,
     WhisperAPISTT,
     VoskSTT,
     DeepgramSTT,
@@ -11,6 +12,7 @@ from .providers import (
 __all__ = [
     "STTProvider",
     "WhisperLocalSTT",
+    "FasterWhisperSTT",
     "WhisperAPISTT",
     "VoskSTT",
     "DeepgramSTT",
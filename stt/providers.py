@@ -5,16 +5,114 @@ Pluggable architecture - add new providers by implementing STTProvider base clas
 
 from abc import ABC, abstractmethod
 from typing import Optional
+from functools import lru_cache
+from math import gcd
+import io
+import json
 import os
-import tempfile
+import wave
 import numpy as np
 
 from config import STTConfig
 
 
+def _to_int16(
+    audio_data: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Scale normalized float samples to int16.
+    
+    Float input is clipped to [-1, 1] into a float32 scratch buffer first,
+    leaving the caller's audio untouched, so overshooting samples saturate
+    instead of wrapping around.
+    """
+    if audio_data.dtype == np.int16:
+        return audio_data
+    if np.issubdtype(audio_data.dtype, np.floating):
+        if scratch is None:
+            scratch = np.empty(audio_data.shape, dtype=np.float32)
+        audio_data = np.clip(audio_data, -1.0, 1.0, out=scratch)
+    if out is None:
+        out = np.empty(audio_data.shape, dtype=np.int16)
+    np.multiply(audio_data, 32767, out=out, casting="unsafe")
+    return out
+
+
+def _cpu_threads(configured: int) -> int:
+    """
+    Number of CPU threads for local inference.
+    
+    Defaults to the physical core count minus one: SMT siblings slow
+    matmul-heavy models down, and a spare core keeps audio capture smooth.
+    """
+    if configured > 0:
+        return configured
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+    except ImportError:
+        cores = None
+    if not cores:
+        # Assume two hardware threads per core
+        cores = (os.cpu_count() or 2) // 2
+    return max(1, cores - 1)
+
+
+@lru_cache(maxsize=8)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    """
+    Design the anti-aliasing FIR filter for an up/down resampling ratio.
+
+    Matches the filter scipy.signal.resample_poly builds by default, but is
+    computed once per ratio instead of on every call.
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    return firwin(20 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+
+
+def _prepare_whisper_audio(audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Convert audio to the float32, 16kHz, [-1, 1] form Whisper models expect."""
+    # Decide by dtype rather than scanning the whole buffer for its peak
+    if audio_data.dtype == np.int16:
+        audio_data = np.multiply(audio_data, np.float32(1.0 / 32768.0), dtype=np.float32)
+    elif audio_data.dtype != np.float32:
+        audio_data = audio_data.astype(np.float32)
+
+    # Polyphase filtering is far cheaper than an FFT over the whole clip
+    if sample_rate != 16000:
+        import scipy.signal
+        g = gcd(sample_rate, 16000)
+        up, down = 16000 // g, sample_rate // g
+        audio_data = scipy.signal.resample_poly(
+            audio_data, up, down, window=_resample_filter(up, down)
+        ).astype(np.float32, copy=False)
+
+    return audio_data
+
+
+def _encode_wav(audio_data: np.ndarray, sample_rate: int) -> io.BytesIO:
+    """Encode mono int16 samples as an in-memory WAV file, rewound for reading."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)  # int16
+        wav.setframerate(sample_rate)
+        wav.writeframes(audio_data.tobytes())
+    buf.seek(0)
+    return buf
+
+
 class STTProvider(ABC):
     """Base class for all STT providers. Implement this to add new STT services."""
     
+    # Replaced per instance by larger buffers as longer clips arrive
+    _i16_scratch: np.ndarray = np.empty(0, dtype=np.int16)
+    _f32_scratch: np.ndarray = np.empty(0, dtype=np.float32)
+    
     @abstractmethod
     def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
         """
@@ -33,6 +131,24 @@ class STTProvider(ABC):
     def get_name(self) -> str:
         """Return the provider name for logging."""
         pass
+    
+    def _int16_samples(self, audio_data: np.ndarray) -> np.ndarray:
+        """Convert audio to int16 in a scratch buffer reused across calls."""
+        if audio_data.dtype == np.int16:
+            return audio_data
+        if self._i16_scratch.size < audio_data.size:
+            self._i16_scratch = np.empty(audio_data.size, dtype=np.int16)
+            self._f32_scratch = np.empty(audio_data.size, dtype=np.float32)
+        out = self._i16_scratch[:audio_data.size].reshape(audio_data.shape)
+        scratch = self._f32_scratch[:audio_data.size].reshape(audio_data.shape)
+        return _to_int16(audio_data, out=out, scratch=scratch)
+    
+    def warmup(self):
+        """
+        Load models ahead of time so the first utterance isn't delayed.
+        Providers without local models have nothing to do.
+        """
+        pass
 
 
 class WhisperLocalSTT(STTProvider):
@@ -56,29 +172,38 @@ class WhisperLocalSTT(STTProvider):
                 else:
                     device = "cpu"
             
+            if device == "cpu":
+                import torch
+                torch.set_num_threads(_cpu_threads(self.config.whisper_threads))
+            
             self._model = whisper.load_model(
                 self.config.whisper_model,
                 device=device,
             )
+            
+            if self.config.whisper_compile and device == "cuda":
+                self._compile_model()
         return self._model
     
-    def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
-        model = self._get_model()
-        
-        # Whisper expects float32 audio normalized to [-1, 1]
-        if audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
+    def _compile_model(self):
+        """
+        Compile the encoder and decoder with torch.compile.
         
-        if audio_data.max() > 1.0:
-            audio_data = audio_data / 32768.0  # Normalize from int16
+        The first transcriptions are slow while kernels are built (run
+        warmup() at startup); Inductor's cache keeps later launches fast.
+        """
+        import torch
         
-        # Resample to 16kHz if needed (Whisper requirement)
-        if sample_rate != 16000:
-            import scipy.signal
-            audio_data = scipy.signal.resample(
-                audio_data,
-                int(len(audio_data) * 16000 / sample_rate)
-            )
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR",
+            os.path.expanduser("~/.cache/friday/inductor"),
+        )
+        self._model.encoder = torch.compile(self._model.encoder, mode="reduce-overhead")
+        self._model.decoder = torch.compile(self._model.decoder, mode="reduce-overhead")
+    
+    def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
+        model = self._get_model()
+        audio_data = _prepare_whisper_audio(audio_data, sample_rate)
         
         result = model.transcribe(
             audio_data,
@@ -88,10 +213,84 @@ class WhisperLocalSTT(STTProvider):
         
         return result["text"].strip()
     
+    def warmup(self):
+        # Run half a second of silence through so kernels are ready
+        model = self._get_model()
+        model.transcribe(
+            np.zeros(8000, dtype=np.float32),
+            language=self.config.whisper_language,
+            fp16=False,
+        )
+    
     def get_name(self) -> str:
         return f"Whisper Local ({self.config.whisper_model})"
 
 
+class FasterWhisperSTT(STTProvider):
+    """
+    Whisper via faster-whisper (CTranslate2) - local, free, several times
+    faster than the reference implementation on CPU thanks to int8 weights.
+    
+    Install: pip install faster-whisper
+    """
+    
+    def __init__(self, config: STTConfig):
+        self.config = config
+        self._model = None
+    
+    def _get_model(self):
+        if self._model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError:
+                raise ImportError(
+                    "faster-whisper required. Run: pip install faster-whisper"
+                )
+            
+            # CTranslate2 supports CPU and CUDA only
+            device = self.config.whisper_device
+            if device == "auto":
+                import ctranslate2
+                device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            elif device == "mps":
+                device = "cpu"
+            
+            self._model = WhisperModel(
+                self.config.whisper_model,
+                device=device,
+                compute_type="int8" if device == "cpu" else "float16",
+                cpu_threads=_cpu_threads(self.config.whisper_threads),
+            )
+        return self._model
+    
+    def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
+        model = self._get_model()
+        audio_data = _prepare_whisper_audio(audio_data, sample_rate)
+        
+        segments, _ = model.transcribe(
+            audio_data,
+            language=self.config.whisper_language,
+            beam_size=1,
+            vad_filter=True,
+        )
+        
+        # Segments are generated lazily; joining runs the decode
+        return "".join(segment.text for segment in segments).strip()
+    
+    def warmup(self):
+        # Run a second of silence through the encoder
+        model = self._get_model()
+        segments, _ = model.transcribe(
+            np.zeros(16000, dtype=np.float32),
+            language=self.config.whisper_language,
+            beam_size=1,
+        )
+        list(segments)
+    
+    def get_name(self) -> str:
+        return f"Faster Whisper ({self.config.whisper_model})"
+
+
 class WhisperAPISTT(STTProvider):
     """OpenAI Whisper API - cloud-based, fast, costs money."""
     
@@ -103,35 +302,22 @@ class WhisperAPISTT(STTProvider):
                 "OpenAI API key required for Whisper API. "
                 "Set OPENAI_API_KEY environment variable."
             )
+        from utils.clients import get_openai_client
+        self._client = get_openai_client(self.api_key)
     
     def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
-        from openai import OpenAI
-        import scipy.io.wavfile
-        
-        client = OpenAI(api_key=self.api_key)
+        # Ensure proper format
+        audio_data = self._int16_samples(audio_data)
         
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
+        # Upload straight from memory rather than via a temporary file
+        wav_buf = _encode_wav(audio_data, sample_rate)
+        result = self._client.audio.transcriptions.create(
+            model="whisper-1",
+            file=("audio.wav", wav_buf, "audio/wav"),
+            language=self.config.whisper_language,
+        )
         
-        try:
-            # Ensure proper format
-            if audio_data.dtype == np.float32:
-                audio_data = (audio_data * 32767).astype(np.int16)
-            
-            scipy.io.wavfile.write(temp_path, sample_rate, audio_data)
-            
-            with open(temp_path, "rb") as audio_file:
-                result = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=self.config.whisper_language,
-                )
-            
-            return result.text.strip()
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        return result.text.strip()
     
     def get_name(self) -> str:
         return "Whisper API"
@@ -143,10 +329,12 @@ class VoskSTT(STTProvider):
     def __init__(self, config: STTConfig):
         self.config = config
         self._model = None
+        self._recognizer_class = None
+        self._recognizers = {}  # One reusable recognizer per sample rate
     
     def _get_model(self):
         if self._model is None:
-            from vosk import Model
+            from vosk import Model, KaldiRecognizer
             
             # Vosk models need to be downloaded separately
             model_path = os.getenv("VOSK_MODEL_PATH", "vosk-model-small-en-us")
@@ -157,26 +345,34 @@ class VoskSTT(STTProvider):
                 )
             
             self._model = Model(model_path)
+            self._recognizer_class = KaldiRecognizer
         return self._model
     
+    def _get_recognizer(self, sample_rate: int):
+        """Return a ready recognizer, reusing the one built for this rate."""
+        recognizer = self._recognizers.get(sample_rate)
+        if recognizer is None:
+            model = self._get_model()
+            recognizer = self._recognizer_class(model, sample_rate)
+            self._recognizers[sample_rate] = recognizer
+        else:
+            recognizer.Reset()
+        return recognizer
+    
     def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
-        from vosk import KaldiRecognizer
-        import json
-        
-        model = self._get_model()
-        recognizer = KaldiRecognizer(model, sample_rate)
+        recognizer = self._get_recognizer(sample_rate)
         
         # Convert to bytes
-        if audio_data.dtype == np.float32:
-            audio_data = (audio_data * 32767).astype(np.int16)
-        
-        audio_bytes = audio_data.tobytes()
+        audio_bytes = self._int16_samples(audio_data).tobytes()
         
         recognizer.AcceptWaveform(audio_bytes)
         result = json.loads(recognizer.FinalResult())
         
         return result.get("text", "").strip()
     
+    def warmup(self):
+        self._get_recognizer(self.config.input_sample_rate)
+    
     def get_name(self) -> str:
         return "Vosk"
 
@@ -191,42 +387,35 @@ class DeepgramSTT(STTProvider):
             raise ValueError(
                 "Deepgram API key required. Set DEEPGRAM_API_KEY environment variable."
             )
+
+        # Keep the HTTPS connection alive between utterances
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        self._session.headers.update({
+            "Authorization": f"Token {self.api_key}",
+            "Content-Type": "audio/wav",
+        })
     
     def transcribe(self, audio_data: np.ndarray, sample_rate: int) -> str:
-        import requests
-        import scipy.io.wavfile
+        audio_data = self._int16_samples(audio_data)
+        
+        # Upload straight from memory rather than via a temporary file
+        wav_buf = _encode_wav(audio_data, sample_rate)
+        response = self._session.post(
+            "https://api.deepgram.com/v1/listen",
+            data=wav_buf.getvalue(),
+            params={
+                "model": "nova-2",
+                "language": "en",
+            },
+        )
         
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
+        response.raise_for_status()
+        result = response.json()
         
-        try:
-            if audio_data.dtype == np.float32:
-                audio_data = (audio_data * 32767).astype(np.int16)
-            
-            scipy.io.wavfile.write(temp_path, sample_rate, audio_data)
-            
-            with open(temp_path, "rb") as audio_file:
-                response = requests.post(
-                    "https://api.deepgram.com/v1/listen",
-                    headers={
-                        "Authorization": f"Token {self.api_key}",
-                        "Content-Type": "audio/wav",
-                    },
-                    data=audio_file.read(),
-                    params={
-                        "model": "nova-2",
-                        "language": "en",
-                    },
-                )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            return result["results"]["channels"][0]["alternatives"][0]["transcript"]
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        return result["results"]["channels"][0]["alternatives"][0]["transcript"]
     
     def get_name(self) -> str:
         return "Deepgram"
@@ -235,6 +424,7 @@ class DeepgramSTT(STTProvider):
 # Provider registry
 STT_PROVIDERS = {
     "whisper": WhisperLocalSTT,
+    "faster_whisper": FasterWhisperSTT,
     "whisper_api": WhisperAPISTT,
     "vosk": VoskSTT,
     "deepgram": DeepgramSTT,
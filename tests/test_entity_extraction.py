@@ -0,0 +1,43 @@
+"""Regression tests for VoiceAssistant._extract_entities."""
+
+import pytest
+
+from core.assistant import VoiceAssistant
+
+
+def extract(text):
+    # _extract_entities doesn't touch instance state, so skip building providers
+    return VoiceAssistant._extract_entities(VoiceAssistant.__new__(VoiceAssistant), text)
+
+
+@pytest.mark.parametrize("text, door", [
+    ("unlock the front door, I'm outside", "front"),
+    ("lock the back door, I'm inside", "back"),
+    ("unlock the front door, I'm beside it", "front"),
+])
+def test_side_inside_words_do_not_add_doors(text, door):
+    entities = extract(text)
+    assert entities["door"] == door
+    assert "doors" not in entities
+
+
+def test_doors_named_together_fan_out():
+    entities = extract("lock the front and back doors")
+    assert entities["doors"] == ["front", "back"]
+
+    entities = extract("lock the front, side and garage doors")
+    assert entities["doors"] == ["front", "side", "garage"]
+
+
+def test_all_doors():
+    assert extract("secure all the doors")["door"] == "all"
+
+
+def test_single_door_without_door_word():
+    assert extract("is the garage locked")["door"] == "garage"
+
+
+def test_rooms_match_whole_words():
+    entities = extract("turn off the kitchen and bedroom lights")
+    assert entities["rooms"] == ["kitchen", "bedroom"]
+    assert "room" not in extract("turn off the attics lights")
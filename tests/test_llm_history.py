@@ -0,0 +1,57 @@
+"""Tests for LLM history trimming and the per-request context window."""
+
+import pytest
+
+from config import LLMConfig, PersonalityConfig
+from llm.providers import LLMProvider
+
+
+class EchoLLM(LLMProvider):
+    def generate_response(self, user_input: str) -> str:
+        return user_input
+
+    def get_name(self) -> str:
+        return "Echo"
+
+
+def converse(max_history, max_context_messages, turns=30):
+    """Run a conversation and return the context sent on each turn."""
+    llm = EchoLLM(
+        LLMConfig(max_history=max_history, max_context_messages=max_context_messages),
+        PersonalityConfig(),
+    )
+    contexts = []
+    for turn in range(turns):
+        llm._add_user_message(f"turn {turn}")
+        contexts.append(llm._context_messages())
+        llm._add_assistant_message(f"reply {turn}")
+    return llm, contexts
+
+
+@pytest.mark.parametrize("max_history", [2, 3, 4])
+def test_small_max_history_keeps_last_exchange(max_history):
+    _, contexts = converse(max_history, 0)
+    for turn, context in enumerate(contexts[1:], start=1):
+        # The previous exchange is still there for the model to refer back to
+        assert context[-2]["content"] == f"reply {turn - 1}"
+        assert context[0]["role"] == "user"
+
+
+@pytest.mark.parametrize("limit", [2, 3, 4, 5, 6, 7, 8])
+def test_context_window_stays_within_limit(limit):
+    _, contexts = converse(20, limit)
+    for turn, context in enumerate(contexts):
+        assert len(context) <= limit
+        assert context[0]["role"] == "user"
+        assert context[-1]["content"].endswith(f"turn {turn}")
+
+
+@pytest.mark.parametrize("limit", [4, 6, 7, 8])
+def test_context_window_shares_prefix_between_turns(limit):
+    _, contexts = converse(20, limit)
+    shared = sum(
+        current[:len(previous)] == previous
+        for previous, current in zip(contexts, contexts[1:])
+    )
+    # The window jumps at most once every other turn instead of every turn
+    assert shared >= (len(contexts) - 1) // 2
@@ -0,0 +1,99 @@
+"""Tests for the SQLite response cache."""
+
+import asyncio
+
+import pytest
+
+from config import DEFAULT_CONFIG, LLMConfig, PersonalityConfig
+from core.assistant import VoiceAssistant
+from core.response_cache import ResponseCache
+from llm.providers import LLMProvider
+from workflows import WorkflowManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.db"), ttl=60)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize("text", [
+    "Who are you?",
+    "Why is the sky blue?",
+    "Tell me more about it",
+    "What is this song called",
+])
+def test_ordinary_questions_are_cacheable(text):
+    assert ResponseCache.is_cacheable(text)
+
+
+@pytest.mark.parametrize("text", [
+    "What's the score?",
+    "Read me the latest news",
+    "What time is it",
+    "What's the weather like tomorrow",
+    "",
+    "?!",
+])
+def test_time_sensitive_questions_are_not_cacheable(text):
+    assert not ResponseCache.is_cacheable(text)
+
+
+def test_lookup_normalizes_the_query(cache):
+    cache.put("Who are you?", "Your butler, sir.")
+    assert cache.get("who ARE you") == "Your butler, sir."
+
+
+def test_namespaces_are_kept_apart(cache):
+    cache.put("yes", "Lights on, sir.", namespace="asked about lights")
+    assert cache.get("yes", namespace="asked about lights") == "Lights on, sir."
+    assert cache.get("yes", namespace="asked about music") is None
+    assert cache.get("yes") is None
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.db"), ttl=0)
+    cache.put("who are you", "Your butler, sir.")
+    try:
+        assert cache.get("who are you") is None
+    finally:
+        cache.close()
+
+
+class CountingLLM(LLMProvider):
+    def __init__(self):
+        super().__init__(LLMConfig(), PersonalityConfig())
+        self.calls = 0
+
+    def generate_response(self, user_input: str) -> str:
+        self.calls += 1
+        self._add_user_message(user_input)
+        reply = f"reply {self.calls}"
+        self._add_assistant_message(reply)
+        return reply
+
+    def get_name(self) -> str:
+        return "Counting"
+
+
+def test_assistant_keys_answers_on_the_previous_reply(cache):
+    # process_input only needs the LLM, workflows and cache, so skip building the rest
+    assistant = VoiceAssistant.__new__(VoiceAssistant)
+    assistant.config = DEFAULT_CONFIG
+    assistant.llm = CountingLLM()
+    assistant.workflows = WorkflowManager()
+    assistant.response_cache = cache
+
+    def ask(text):
+        return asyncio.run(assistant.process_input(text))
+
+    assert ask("sure") == "reply 1"
+    assert ask("who are you") == "reply 2"
+    # Same question, but after a different reply: not a replay
+    assert ask("sure") == "reply 3"
+
+    assistant.llm.clear_history()
+    # Same question at the same point in a conversation: replayed
+    assert ask("sure") == "reply 1"
+    assert assistant.llm.calls == 3
@@ -0,0 +1,39 @@
+"""Tests for speaking a streamed response sentence by sentence."""
+
+from config import DEFAULT_CONFIG
+from core.assistant import AssistantState, VoiceAssistant
+
+
+def make_assistant():
+    # speak_stream only needs state handling and _play, so skip building providers
+    assistant = VoiceAssistant.__new__(VoiceAssistant)
+    assistant.config = DEFAULT_CONFIG
+    assistant.state = AssistantState.THINKING
+    assistant.on_state_change = None
+    assistant.spoken = []
+    assistant._play = assistant.spoken.append
+    return assistant
+
+
+def test_sentences_are_spoken_as_they_complete():
+    assistant = make_assistant()
+    heard_before_end = []
+
+    def chunks():
+        yield "Good evening, sir. The wea"
+        heard_before_end.append(list(assistant.spoken))
+        yield "ther is fine! Anything"
+        yield " else?"
+
+    response = assistant.speak_stream(chunks())
+
+    assert heard_before_end == [["Good evening, sir."]]
+    assert assistant.spoken == ["Good evening, sir.", "The weather is fine!", "Anything else?"]
+    assert response == "Good evening, sir. The weather is fine! Anything else?"
+    assert assistant.state == AssistantState.IDLE
+
+
+def test_single_chunk_without_punctuation_is_spoken():
+    assistant = make_assistant()
+    assert assistant.speak_stream(iter(["Lights are on"])) == "Lights are on"
+    assert assistant.spoken == ["Lights are on"]
@@ -5,6 +5,7 @@ from .providers import (
     PiperTTS,
     CoquiTTS,
     SystemTTS,
+    CachedTTS,
     TTS_PROVIDERS,
     get_tts_provider,
 )
@@ -16,6 +17,7 @@ __all__ = [
     "PiperTTS",
     "CoquiTTS",
     "SystemTTS",
+    "CachedTTS",
     "TTS_PROVIDERS",
     "get_tts_provider",
 ]
@@ -4,10 +4,17 @@ Pluggable architecture - add new providers by implementing TTSProvider base clas
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import asdict
+from typing import Optional, Iterator, List
+import hashlib
+import json
 import os
+import shutil
 import tempfile
 import subprocess
+import threading
+import time
+import uuid
 
 from config import TTSConfig
 
@@ -33,11 +40,57 @@ class TTSProvider(ABC):
         """
         pass
 
+    def synthesize_batch(self, texts: List[str]) -> List[bytes]:
+        """
+        Convert several texts to speech, e.g. the sentences of one reply.
+
+        Providers that can pipeline work override this; the default
+        synthesizes each text in turn.
+
+        Args:
+            texts: The texts to synthesize
+
+        Returns:
+            One audio clip per text, in the same order
+        """
+        return [self.synthesize(text) for text in texts]
+
+    # Sample rate of the PCM yielded by synthesize_stream, or None when
+    # the provider can only return complete clips
+    stream_sample_rate: Optional[int] = None
+
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether synthesize_stream is implemented by this provider."""
+        return self.stream_sample_rate is not None
+
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        """
+        Convert text to speech, yielding audio as it is generated.
+
+        Lets playback start before the whole clip has been synthesized.
+        Optional: only call it when supports_streaming is True.
+
+        Args:
+            text: The text to synthesize
+
+        Yields:
+            Chunks of raw 16-bit mono PCM at stream_sample_rate
+        """
+        raise NotImplementedError(f"{self.get_name()} does not support streaming")
+
     @abstractmethod
     def get_name(self) -> str:
         """Return the provider name for logging."""
         pass
 
+    def warmup(self):
+        """
+        Load models ahead of time so the first response isn't delayed.
+        Providers without local models have nothing to do.
+        """
+        pass
+
 
 class ElevenLabsTTS(TTSProvider):
     """ElevenLabs TTS provider - high quality, requires API key."""
@@ -54,19 +107,22 @@ class ElevenLabsTTS(TTSProvider):
                 "ElevenLabs API key required. Set ELEVENLABS_API_KEY environment variable "
                 "or pass elevenlabs_api_key in TTSConfig."
             )
-    
-    def synthesize(self, text: str) -> bytes:
+
+        # Keep the HTTPS connection alive between utterances
         import requests
-        
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.config.elevenlabs_voice_id}"
-        
-        headers = {
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        self._session.headers.update({
             "Accept": "audio/mpeg",
             "Content-Type": "application/json",
             "xi-api-key": self.api_key,
-        }
-        
-        data = {
+        })
+    
+    stream_sample_rate = 22050
+
+    def _request_data(self, text: str) -> dict:
+        return {
             "text": text,
             "model_id": self.config.elevenlabs_model,
             "voice_settings": {
@@ -74,12 +130,30 @@ class ElevenLabsTTS(TTSProvider):
                 "similarity_boost": self.config.elevenlabs_similarity_boost,
             }
         }
+    
+    def synthesize(self, text: str) -> bytes:
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.config.elevenlabs_voice_id}"
         
-        response = requests.post(url, json=data, headers=headers)
+        response = self._session.post(url, json=self._request_data(text))
         response.raise_for_status()
         
         return response.content
     
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{self.config.elevenlabs_voice_id}/stream"
+        
+        # Raw PCM can be played chunk by chunk without an MP3 decoder
+        with self._session.post(
+            url,
+            json=self._request_data(text),
+            params={"output_format": f"pcm_{self.stream_sample_rate}"},
+            # The session asks for audio/mpeg by default
+            headers={"Accept": "*/*"},
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=4096)
+    
     def get_name(self) -> str:
         return "ElevenLabs"
 
@@ -99,13 +173,11 @@ class OpenAITTS(TTSProvider):
                 "OpenAI API key required. Set OPENAI_API_KEY environment variable "
                 "or pass openai_api_key in TTSConfig."
             )
+        from utils.clients import get_openai_client
+        self._client = get_openai_client(self.api_key)
     
     def synthesize(self, text: str) -> bytes:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=self.api_key)
-        
-        response = client.audio.speech.create(
+        response = self._client.audio.speech.create(
             model=self.config.openai_model,
             voice=self.config.openai_voice,
             input=text,
@@ -113,44 +185,153 @@ class OpenAITTS(TTSProvider):
         
         return response.content
     
+    # OpenAI's "pcm" format is fixed at 24kHz
+    stream_sample_rate = 24000
+    
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        with self._client.audio.speech.with_streaming_response.create(
+            model=self.config.openai_model,
+            voice=self.config.openai_voice,
+            input=text,
+            response_format="pcm",
+        ) as response:
+            yield from response.iter_bytes(chunk_size=4096)
+    
     def get_name(self) -> str:
         return "OpenAI TTS"
 
 
 class PiperTTS(TTSProvider):
-    """Piper TTS - local, fast, free. Requires piper-tts installed."""
+    """
+    Piper TTS - local, fast, free. Requires piper-tts installed.
+    
+    Keeps one piper process running so the voice model is loaded once,
+    rather than spawning piper (and reloading the model) per utterance.
+    """
     
     def __init__(self, config: TTSConfig):
         self.config = config
         self.model_path = config.piper_model_path or self._get_default_model_path()
+        self._process: Optional[subprocess.Popen] = None
+        self._output_dir: Optional[str] = None
+        self._lock = threading.Lock()
     
     def _get_default_model_path(self) -> str:
         """Get default model path based on model name."""
         home = os.path.expanduser("~")
         return os.path.join(home, ".local", "share", "piper", self.config.piper_model)
     
-    def synthesize(self, text: str) -> bytes:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            output_path = f.name
-        
-        try:
-            # Run piper command
-            process = subprocess.run(
+    def _get_process(self) -> subprocess.Popen:
+        """Start piper on first use, or restart it if it has exited."""
+        if self._process is None or self._process.poll() is not None:
+            if self._output_dir is None:
+                self._output_dir = tempfile.mkdtemp(prefix="piper-")
+            
+            # With --json-input piper reads one JSON request per stdin line and
+            # writes each utterance to the output_file named in the request
+            self._process = subprocess.Popen(
                 [
                     "piper",
                     "--model", self.model_path,
-                    "--output_file", output_path,
+                    "--json-input",
                 ],
-                input=text.encode(),
-                capture_output=True,
-                check=True,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
             )
+        return self._process
+    
+    def _kill_process(self):
+        """Kill a stuck piper process so the next request starts a fresh one."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+    
+    @staticmethod
+    def _read_finished_wav(path: str) -> Optional[bytes]:
+        """Return the WAV at path once fully written, or None if it isn't yet."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        
+        # The RIFF size field is only final once the writer has closed the file
+        if len(data) < 44 or data[:4] != b"RIFF":
+            return None
+        if int.from_bytes(data[4:8], "little") != len(data) - 8:
+            return None
+        return data
+    
+    def synthesize(self, text: str) -> bytes:
+        return self.synthesize_batch([text])[0]
+    
+    def synthesize_batch(self, texts: List[str]) -> List[bytes]:
+        # Newlines would split a text into several utterances, and piper
+        # silently skips blank ones, so we'd wait on a file that never comes
+        texts = [" ".join(text.split()) for text in texts]
+        if not all(texts):
+            raise ValueError("Piper cannot synthesize empty text")
+        
+        with self._lock:
+            process = self._get_process()
+            output_paths = [
+                os.path.join(self._output_dir, f"{uuid.uuid4().hex}.wav")
+                for _ in texts
+            ]
             
-            with open(output_path, "rb") as f:
-                return f.read()
-        finally:
-            if os.path.exists(output_path):
-                os.unlink(output_path)
+            try:
+                # Queue every utterance at once so piper never waits on us between them
+                process.stdin.write("".join(
+                    json.dumps({"text": text, "output_file": path}) + "\n"
+                    for text, path in zip(texts, output_paths)
+                ))
+                process.stdin.flush()
+                
+                deadline = time.monotonic() + self.config.piper_timeout
+                clips = []
+                for output_path in output_paths:
+                    while (clip := self._read_finished_wav(output_path)) is None:
+                        if process.poll() is not None:
+                            raise RuntimeError("Piper exited without producing audio")
+                        if time.monotonic() > deadline:
+                            self._kill_process()
+                            raise RuntimeError(
+                                f"Piper produced no audio within {self.config.piper_timeout}s"
+                            )
+                        time.sleep(0.01)
+                    clips.append(clip)
+                return clips
+            except BrokenPipeError:
+                raise RuntimeError("Piper exited without producing audio")
+            finally:
+                for output_path in output_paths:
+                    if os.path.exists(output_path):
+                        os.unlink(output_path)
+    
+    def warmup(self):
+        self._get_process()
+    
+    def close(self):
+        """Stop the piper process and remove its output directory."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.stdin.close()
+                try:
+                    self._process.wait(timeout=2.0)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+            self._process = None
+        
+        if self._output_dir is not None:
+            shutil.rmtree(self._output_dir, ignore_errors=True)
+            self._output_dir = None
+    
+    def __del__(self):
+        self.close()
     
     def get_name(self) -> str:
         return "Piper"
@@ -184,6 +365,9 @@ class CoquiTTS(TTSProvider):
             if os.path.exists(output_path):
                 os.unlink(output_path)
     
+    def warmup(self):
+        self._get_tts()
+    
     def get_name(self) -> str:
         return "Coqui TTS"
 
@@ -235,6 +419,138 @@ class SystemTTS(TTSProvider):
         return "System TTS"
 
 
+class CachedTTS(TTSProvider):
+    """
+    Wraps another provider with an on-disk cache of synthesized audio.
+    
+    Clips are keyed on the provider, its voice settings and the text, so
+    stock phrases ("Very good, sir.") are synthesized once and then read
+    back from disk. The least recently used clips are evicted once the
+    cache grows past config.cache_max_mb.
+    """
+    
+    def __init__(self, provider: TTSProvider, config: TTSConfig):
+        self.provider = provider
+        self.config = config
+        self.cache_dir = os.path.expanduser(config.cache_dir)
+        self.max_bytes = config.cache_max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Everything that changes the produced audio, minus credentials
+        settings = {
+            key: value for key, value in asdict(config).items()
+            if not key.endswith("api_key") and not key.startswith("cache_")
+        }
+        self._identity = json.dumps(
+            [provider.get_name(), settings], sort_keys=True, default=str
+        )
+        self._size = sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_dir)
+            if entry.is_file()
+        )
+    
+    @property
+    def audio_format(self) -> str:
+        return self.provider.audio_format
+    
+    @property
+    def stream_sample_rate(self) -> Optional[int]:
+        return self.provider.stream_sample_rate
+    
+    def _path(self, text: str, kind: str = "clip") -> str:
+        digest = hashlib.blake2b(
+            f"{self._identity}\0{kind}\0{text}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.bin")
+    
+    def _load(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # Mark as recently used
+        return audio
+    
+    def synthesize(self, text: str) -> bytes:
+        path = self._path(text)
+        audio = self._load(path)
+        if audio is None:
+            audio = self.provider.synthesize(text)
+            self._store(path, audio)
+        return audio
+    
+    def synthesize_batch(self, texts: List[str]) -> List[bytes]:
+        paths = [self._path(text) for text in texts]
+        clips = [self._load(path) for path in paths]
+        
+        # Hand only the misses to the provider, as one batch
+        missing = [i for i, clip in enumerate(clips) if clip is None]
+        if missing:
+            fresh = self.provider.synthesize_batch([texts[i] for i in missing])
+            for i, audio in zip(missing, fresh):
+                self._store(paths[i], audio)
+                clips[i] = audio
+        return clips
+    
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        # Checked here rather than inside the generator so it fails on call
+        if not self.supports_streaming:
+            raise NotImplementedError(f"{self.get_name()} does not support streaming")
+        return self._cached_stream(text)
+    
+    def _cached_stream(self, text: str) -> Iterator[bytes]:
+        # Streamed PCM is cached separately from the provider's encoded clips
+        path = self._path(text, kind="pcm")
+        audio = self._load(path)
+        if audio is not None:
+            yield audio
+            return
+        
+        chunks = []
+        for chunk in self.provider.synthesize_stream(text):
+            chunks.append(chunk)
+            yield chunk
+        self._store(path, b"".join(chunks))
+    
+    def _store(self, path: str, audio: bytes):
+        # Write then rename so a concurrent reader never sees a partial clip
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._size += len(audio)
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def _evict(self):
+        """Delete least recently used clips until the cache is back under 90% of its limit."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        self._size = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self._size <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.unlink(entry.path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+    
+    def warmup(self):
+        self.provider.warmup()
+    
+    def get_name(self) -> str:
+        return self.provider.get_name()
+
+
 # Provider registry - add new providers here
 TTS_PROVIDERS = {
     "elevenlabs": ElevenLabsTTS,
@@ -262,4 +578,7 @@ def get_tts_provider(config: TTSConfig) -> TTSProvider:
             f"Unknown TTS provider: {config.provider}. Available: {available}"
         )
     
-    return provider_class(config)
+    provider = provider_class(config)
+    if config.cache_enabled:
+        provider = CachedTTS(provider, config)
+    return provider
@@ -2,6 +2,8 @@ from .audio import (
     AudioConfig,
     AudioRecorder,
     AudioPlayer,
+    MicStream,
+    MicReader,
     list_audio_devices,
     get_default_input_device,
     get_default_output_device,
@@ -16,11 +18,15 @@ from .wakeword import (
     get_wake_word_detector,
 )
 
+from .clients import get_openai_client
+
 __all__ = [
     # Audio
     "AudioConfig",
     "AudioRecorder",
     "AudioPlayer",
+    "MicStream",
+    "MicReader",
     "list_audio_devices",
     "get_default_input_device",
     "get_default_output_device",
@@ -32,4 +38,7 @@ __all__ = [
     "KeyboardWakeDetector",
     "WAKE_WORD_DETECTORS",
     "get_wake_word_detector",
+    
+    # Shared clients
+    "get_openai_client",
 ]
@@ -3,11 +3,15 @@ Audio utilities for recording from microphone and playing back audio.
 Cross-platform implementation using sounddevice.
 """
 
+import io
+import queue
+import shutil
+import subprocess
 import numpy as np
 import threading
-import queue
 import time
-from typing import Optional, Callable
+from collections import deque
+from typing import Optional, Callable, Iterable, Iterator
 from dataclasses import dataclass
 
 try:
@@ -23,16 +27,172 @@ class AudioConfig:
     sample_rate: int = 16000
     channels: int = 1
     dtype: str = "float32"
-    blocksize: int = 1024
+    blocksize: int = 512  # Matches the wake word detectors so they share one stream
     silence_threshold: float = 0.01
     silence_duration: float = 1.5  # Seconds of silence to stop recording
     max_recording_duration: float = 30.0  # Maximum recording length
+    notify_interval: float = 0.1  # Seconds of audio gathered before waking the reader
+
+
+class MicStream:
+    """
+    One always-open microphone input shared by every audio consumer.
+    
+    Opening a PortAudio stream reconfigures the device, so the recorder and
+    wake word detectors subscribe to this stream instead of each opening
+    their own. Subscribers get every block as a mono int16 array on the
+    audio thread; they must return quickly and copy anything they keep.
+    Multi-channel input is downmixed before it reaches subscribers.
+    """
+    
+    _shared: dict = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, blocksize: int = 512):
+        if sd is None:
+            raise ImportError("sounddevice is required. Run: pip install sounddevice")
+        
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        # Replaced, never mutated, so the audio thread can iterate it unlocked
+        self._subscribers: tuple = ()
+        self._lock = threading.Lock()
+        self._stream: Optional[sd.RawInputStream] = None
+        self._status = None
+    
+    @classmethod
+    def shared(cls, sample_rate: int = 16000, channels: int = 1, blocksize: int = 512) -> "MicStream":
+        """Return the process-wide stream for this capture configuration."""
+        key = (sample_rate, channels, blocksize)
+        with cls._shared_lock:
+            mic = cls._shared.get(key)
+            if mic is None:
+                mic = cls._shared[key] = cls(sample_rate, channels, blocksize)
+            return mic
+    
+    @classmethod
+    def close_shared(cls):
+        """Close every shared stream, releasing the microphone."""
+        with cls._shared_lock:
+            mics = list(cls._shared.values())
+            cls._shared.clear()
+        for mic in mics:
+            mic.close()
+    
+    def _callback(self, indata, frames, time_info, status):
+        """Fan each block out to the subscribers. Runs on PortAudio's thread."""
+        if status:
+            self._status = status
+        
+        samples = np.frombuffer(indata, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1).astype(np.int16)
+        for subscriber in self._subscribers:
+            subscriber(samples)
+    
+    def subscribe(self, callback: Callable[[np.ndarray], None]):
+        """Start delivering blocks to callback, opening the stream if needed."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + (callback,)
+            
+            if self._stream is None:
+                self._stream = sd.RawInputStream(
+                    samplerate=self.sample_rate,
+                    channels=self.channels,
+                    dtype='int16',
+                    blocksize=self.blocksize,
+                    callback=self._callback,
+                )
+                self._stream.start()
+    
+    def unsubscribe(self, callback: Callable[[np.ndarray], None]):
+        """Stop delivering blocks to callback. The stream stays open."""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s != callback)
+    
+    def pop_status(self):
+        """Return and clear the last overflow/underflow status, if any."""
+        status = self._status
+        self._status = None
+        return status
+    
+    def close(self):
+        """Drop all subscribers and close the stream."""
+        with self._lock:
+            self._subscribers = ()
+            if self._stream:
+                self._stream.stop()
+                self._stream.close()
+                self._stream = None
+
+
+class MicReader:
+    """
+    Fixed-size blocking frame reads from a MicStream, for consumers that
+    process audio on their own thread (e.g. wake word engines).
+    
+    Use as a context manager to subscribe and unsubscribe.
+    """
+    
+    def __init__(self, mic: MicStream, frame_length: int, max_pending: int = 64):
+        self.mic = mic
+        self.frame_length = frame_length
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._pending = np.empty(0, dtype=np.int16)
+    
+    def __enter__(self) -> "MicReader":
+        self.mic.subscribe(self._on_samples)
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.mic.unsubscribe(self._on_samples)
+    
+    def _on_samples(self, samples: np.ndarray):
+        try:
+            self._queue.put_nowait(samples.copy())
+        except queue.Full:
+            pass  # Reader has fallen behind; drop rather than stall the audio thread
+    
+    def read(self, timeout: float = 0.5) -> Optional[np.ndarray]:
+        """
+        Return the next frame_length samples as int16.
+        
+        Returns:
+            The frame, or None if no audio arrived within timeout
+        """
+        n = self.frame_length
+        while len(self._pending) < n:
+            try:
+                chunk = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            self._pending = np.concatenate((self._pending, chunk)) if len(self._pending) else chunk
+        
+        frame = self._pending[:n]
+        self._pending = self._pending[n:]
+        return frame
+    
+    def drain(self):
+        """Discard queued audio, e.g. what was heard while a wake callback ran."""
+        self._pending = np.empty(0, dtype=np.int16)
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
 
 
 class AudioRecorder:
     """
     Records audio from the microphone.
     Supports manual start/stop and automatic silence detection.
+    
+    Samples are written straight into one buffer, preallocated for the
+    maximum recording length, instead of queueing a copy of every block.
+    Audio comes from the shared MicStream, so starting a recording doesn't
+    open a new device stream.
     """
     
     def __init__(self, config: Optional[AudioConfig] = None):
@@ -40,47 +200,72 @@ class AudioRecorder:
             raise ImportError("sounddevice is required. Run: pip install sounddevice")
         
         self.config = config or AudioConfig()
-        self._audio_queue: queue.Queue = queue.Queue()
+        self._buffer = np.empty(
+            int(self.config.max_recording_duration * self.config.sample_rate),
+            dtype=self.config.dtype,
+        )
+        # The shared stream delivers int16; float buffers are scaled to [-1, 1)
+        self._scale = (
+            np.float32(1.0 / 32768.0)
+            if np.issubdtype(self._buffer.dtype, np.floating) else None
+        )
+        # The audio callback is the only writer of these; the recording
+        # thread only reads them, so no lock is needed between the two
+        self._write_pos = 0
+        self._notified_pos = 0
+        self._data_ready = threading.Event()
+        self._notify_samples = max(1, int(self.config.notify_interval * self.config.sample_rate))
         self._is_recording = False
-        self._stream: Optional[sd.InputStream] = None
+        self._mic = MicStream.shared(
+            self.config.sample_rate, self.config.channels, self.config.blocksize
+        )
     
-    def _audio_callback(self, indata, frames, time_info, status):
-        """Callback for audio stream."""
+    def _audio_callback(self, samples: np.ndarray):
+        """MicStream subscriber. Runs on PortAudio's real-time thread."""
+        if not self._is_recording:
+            return
+        
+        start = self._write_pos
+        count = min(len(samples), len(self._buffer) - start)
+        if count > 0:
+            out = self._buffer[start:start + count]
+            if self._scale is not None:
+                np.multiply(samples[:count], self._scale, out=out, casting='unsafe')
+            else:
+                out[:] = samples[:count]
+            # Publish the new position only once the samples are in place
+            self._write_pos = start + count
+        
+        # Wake the reader once per notify_interval rather than every block
+        if (
+            self._write_pos - self._notified_pos >= self._notify_samples
+            or self._write_pos == len(self._buffer)
+        ):
+            self._notified_pos = self._write_pos
+            self._data_ready.set()
+    
+    def _report_status(self):
+        """Print any overflow/underflow flagged by the audio callback."""
+        status = self._mic.pop_status()
         if status:
             print(f"Audio status: {status}")
-        self._audio_queue.put(indata.copy())
     
     def start_recording(self):
         """Start recording audio."""
-        self._audio_queue = queue.Queue()
+        self._write_pos = 0
+        self._notified_pos = 0
+        self._data_ready.clear()
         self._is_recording = True
-        
-        self._stream = sd.InputStream(
-            samplerate=self.config.sample_rate,
-            channels=self.config.channels,
-            dtype=self.config.dtype,
-            blocksize=self.config.blocksize,
-            callback=self._audio_callback,
-        )
-        self._stream.start()
+        self._mic.subscribe(self._audio_callback)
     
     def stop_recording(self) -> np.ndarray:
         """Stop recording and return the audio data."""
         self._is_recording = False
+        self._mic.unsubscribe(self._audio_callback)
+        self._report_status()
         
-        if self._stream:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
-        
-        # Collect all audio data
-        chunks = []
-        while not self._audio_queue.empty():
-            chunks.append(self._audio_queue.get())
-        
-        if chunks:
-            return np.concatenate(chunks, axis=0).flatten()
-        return np.array([], dtype=np.float32)
+        # Copy out so the next recording can reuse the buffer
+        return self._buffer[:self._write_pos].copy()
     
     def record_until_silence(
         self,
@@ -99,8 +284,17 @@ class AudioRecorder:
         """
         self.start_recording()
         
-        chunks = []
-        silence_start = None
+        # Compare mean squares against the squared threshold to skip the sqrt
+        threshold_sq = self.config.silence_threshold ** 2
+        
+        # Running sum of squares over the trailing silence_duration of audio;
+        # each block adds its own sum and evicted blocks subtract theirs
+        window_samples = int(self.config.silence_duration * self.config.sample_rate)
+        window_blocks: deque = deque()
+        window_sum = 0.0
+        window_len = 0
+        
+        read_pos = 0
         speech_detected = False
         start_time = time.time()
         
@@ -110,40 +304,48 @@ class AudioRecorder:
                 if time.time() - start_time > self.config.max_recording_duration:
                     break
                 
-                try:
-                    chunk = self._audio_queue.get(timeout=0.1)
-                    chunks.append(chunk)
-                    
-                    # Check for silence
-                    rms = np.sqrt(np.mean(chunk**2))
-                    
-                    if rms > self.config.silence_threshold:
-                        # Speech detected
-                        if not speech_detected:
-                            speech_detected = True
-                            if on_speech_start:
-                                on_speech_start()
-                        silence_start = None
-                    else:
-                        # Silence detected
-                        if speech_detected:
-                            if silence_start is None:
-                                silence_start = time.time()
-                            elif time.time() - silence_start > self.config.silence_duration:
-                                # Enough silence, stop recording
-                                if on_speech_end:
-                                    on_speech_end()
-                                break
+                # The timeout is a fallback; normally the callback wakes us
+                self._data_ready.wait(timeout=self.config.notify_interval * 2)
+                self._data_ready.clear()
+                self._report_status()
                 
-                except queue.Empty:
+                write_pos = self._write_pos
+                if write_pos == read_pos:
+                    if write_pos == len(self._buffer):
+                        break  # Buffer full
                     continue
+                chunk = self._buffer[read_pos:write_pos]
+                read_pos = write_pos
+                
+                block_sum = float(np.dot(chunk, chunk))
+                window_blocks.append((block_sum, len(chunk)))
+                window_sum += block_sum
+                window_len += len(chunk)
+                while window_len - window_blocks[0][1] >= window_samples:
+                    evicted_sum, evicted_len = window_blocks.popleft()
+                    window_sum -= evicted_sum
+                    window_len -= evicted_len
+                
+                if block_sum > threshold_sq * len(chunk):
+                    # Speech detected
+                    if not speech_detected:
+                        speech_detected = True
+                        if on_speech_start:
+                            on_speech_start()
+                elif (
+                    speech_detected
+                    and window_len >= window_samples
+                    and window_sum <= threshold_sq * window_len
+                ):
+                    # The trailing window has gone quiet, stop recording
+                    if on_speech_end:
+                        on_speech_end()
+                    break
         
         finally:
-            self.stop_recording()
+            audio = self.stop_recording()
         
-        if chunks:
-            return np.concatenate(chunks, axis=0).flatten()
-        return np.array([], dtype=np.float32)
+        return audio
 
 
 class AudioPlayer:
@@ -179,49 +381,123 @@ class AudioPlayer:
             filepath: Path to audio file
             blocking: Wait for playback to finish
         """
-        import scipy.io.wavfile as wav
-        
         if filepath.endswith(".wav"):
-            rate, data = wav.read(filepath)
-            # Normalize if int16
-            if data.dtype == np.int16:
-                data = data.astype(np.float32) / 32768.0
+            self._play_encoded(filepath, "wav", blocking)
+        elif filepath.endswith(".mp3"):
+            self._play_encoded(filepath, "mp3", blocking)
+        else:
+            raise ValueError(f"Unsupported audio format: {filepath}")
+    
+    def play_bytes(self, audio_bytes: bytes, format: str = "mp3", blocking: bool = True):
+        """
+        Play audio from bytes.
+        
+        Args:
+            audio_bytes: Raw audio bytes
+            format: Audio format (mp3, wav)
+            blocking: Wait for playback to finish
+        """
+        # Decode straight from memory rather than via a temporary file
+        self._play_encoded(io.BytesIO(audio_bytes), format, blocking)
+    
+    def _play_encoded(self, source, format: str, blocking: bool):
+        """Decode a WAV or MP3 path or file object and play it."""
+        if format == "wav":
+            import scipy.io.wavfile as wav
+            
+            # sounddevice plays int16 natively, so no float conversion is needed
+            rate, data = wav.read(source)
             self.play(data, rate, blocking)
         
-        elif filepath.endswith(".mp3"):
+        elif format == "mp3":
+            # Stream-decode through ffmpeg so playback starts right away
+            if blocking and shutil.which("ffmpeg"):
+                self.play_stream(self._decode_mp3_stream(source), self._MP3_STREAM_RATE)
+                return
+            
             # Use pydub or ffmpeg for MP3
             try:
                 from pydub import AudioSegment
-                audio = AudioSegment.from_mp3(filepath)
-                samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
-                samples = samples / 32768.0  # Normalize
-                self.play(samples, audio.frame_rate, blocking)
             except ImportError:
                 raise ImportError("pydub required for MP3 playback. Run: pip install pydub")
+            
+            audio = AudioSegment.from_file(source, format="mp3")
+            if audio.sample_width != 2:
+                audio = audio.set_sample_width(2)
+            samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+            if audio.channels > 1:
+                samples = samples.reshape(-1, audio.channels)
+            self.play(samples, audio.frame_rate, blocking)
         
         else:
-            raise ValueError(f"Unsupported audio format: {filepath}")
+            raise ValueError(f"Unsupported audio format: {format}")
     
-    def play_bytes(self, audio_bytes: bytes, format: str = "mp3", blocking: bool = True):
+    # Rate MP3 is decoded to when streamed; covers both 44.1kHz and 24kHz sources
+    _MP3_STREAM_RATE = 44100
+    
+    def _decode_mp3_stream(self, source) -> Iterator[bytes]:
         """
-        Play audio from bytes.
+        Decode MP3 to 16-bit mono PCM with ffmpeg, yielding it as it is produced.
         
         Args:
-            audio_bytes: Raw audio bytes
-            format: Audio format (mp3, wav)
-            blocking: Wait for playback to finish
+            source: Path or file object holding the MP3 data
         """
-        import tempfile
-        import os
+        from_file = isinstance(source, str)
+        process = subprocess.Popen(
+            [
+                "ffmpeg", "-loglevel", "error",
+                "-f", "mp3", "-i", source if from_file else "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(self._MP3_STREAM_RATE),
+                "pipe:1",
+            ],
+            stdin=subprocess.DEVNULL if from_file else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
         
-        with tempfile.NamedTemporaryFile(suffix=f".{format}", delete=False) as f:
-            f.write(audio_bytes)
-            temp_path = f.name
+        # Feed the encoded data from a separate thread while we read PCM
+        writer = None
+        if not from_file:
+            def feed():
+                try:
+                    process.stdin.write(source.read())
+                except BrokenPipeError:
+                    pass
+                finally:
+                    process.stdin.close()
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
         
         try:
-            self.play_file(temp_path, blocking)
+            while True:
+                chunk = process.stdout.read(4096)
+                if not chunk:
+                    break
+                yield chunk
         finally:
-            os.unlink(temp_path)
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            if writer is not None:
+                writer.join()
+    
+    def play_stream(self, chunks: Iterable[bytes], sample_rate: int):
+        """
+        Play raw 16-bit mono PCM as it arrives (blocking).
+        
+        Args:
+            chunks: Iterable of PCM byte chunks, e.g. from a streaming TTS provider
+            sample_rate: Sample rate of the PCM
+        """
+        with sd.RawOutputStream(samplerate=sample_rate, channels=1, dtype="int16") as stream:
+            leftover = b""
+            for chunk in chunks:
+                # Chunks can split a sample in two; carry the odd byte over
+                data = leftover + chunk
+                usable = len(data) - len(data) % 2
+                if usable:
+                    stream.write(data[:usable])
+                leftover = data[usable:]
     
     def stop(self):
         """Stop current playback."""
@@ -0,0 +1,42 @@
+"""
+Shared API clients.
+One client per API key, so STT, TTS and LLM calls reuse the same connection pool.
+"""
+
+import threading
+from typing import Dict
+
+
+_openai_clients: Dict[str, object] = {}
+_openai_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str):
+    """
+    Get the shared OpenAI client for an API key, creating it on first use.
+    
+    Uses HTTP/2 when the h2 package is installed, so concurrent requests
+    are multiplexed over a single connection.
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        openai.OpenAI instance
+    """
+    with _openai_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            
+            kwargs = {"api_key": api_key}
+            try:
+                import h2  # noqa: F401
+                from openai import DefaultHttpxClient
+                kwargs["http_client"] = DefaultHttpxClient(http2=True)
+            except ImportError:
+                pass
+            
+            client = OpenAI(**kwargs)
+            _openai_clients[api_key] = client
+        return client
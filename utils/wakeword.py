@@ -4,13 +4,18 @@ Supports multiple wake word engines.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import astuple, replace
+from functools import lru_cache
 from typing import Optional, Callable
+import io
 import os
-import numpy as np
+import selectors
+import sys
 import threading
 import time
 
 from config import WakeWordConfig
+from .audio import MicStream, MicReader
 
 
 class WakeWordDetector(ABC):
@@ -35,6 +40,13 @@ class WakeWordDetector(ABC):
     def get_name(self) -> str:
         """Return detector name."""
         pass
+    
+    def close(self):
+        """
+        Stop listening and release the engine.
+        stop() keeps the engine loaded so start() can re-arm instantly.
+        """
+        self.stop()
 
 
 class PorcupineDetector(WakeWordDetector):
@@ -53,7 +65,10 @@ class PorcupineDetector(WakeWordDetector):
         self._thread: Optional[threading.Thread] = None
     
     def _initialize(self):
-        """Initialize Porcupine engine."""
+        """Initialize Porcupine engine (once; reused across start/stop)."""
+        if self._porcupine is not None:
+            return
+        
         try:
             import pvporcupine
         except ImportError:
@@ -92,24 +107,20 @@ class PorcupineDetector(WakeWordDetector):
     
     def _detection_loop(self, callback: Callable[[], None]):
         """Main detection loop."""
-        import sounddevice as sd
-        
         frame_length = self._porcupine.frame_length
-        sample_rate = self._porcupine.sample_rate
+        mic = MicStream.shared(self._porcupine.sample_rate)
         
-        with sd.InputStream(
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32',
-            blocksize=frame_length,
-        ) as stream:
+        # The shared mic stream delivers int16 PCM, which Porcupine consumes as-is
+        with MicReader(mic, frame_length) as reader:
             while self._running:
-                audio_data, _ = stream.read(frame_length)
-                audio_frame = (audio_data.flatten() * 32767).astype(np.int16)
-                keyword_index = self._porcupine.process(audio_frame)
+                audio_frame = reader.read()
+                if audio_frame is None:
+                    continue
                 
-                if keyword_index >= 0:
+                if self._porcupine.process(audio_frame) >= 0:
                     callback()
+                    # Don't score the command and spoken reply queued meanwhile
+                    reader.drain()
     
     def start(self, callback: Callable[[], None]):
         """Start listening for wake word."""
@@ -130,6 +141,10 @@ class PorcupineDetector(WakeWordDetector):
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
+    
+    def close(self):
+        """Stop listening and free the Porcupine engine."""
+        self.stop()
         
         if self._porcupine:
             self._porcupine.delete()
@@ -149,11 +164,15 @@ class OpenWakeWordDetector(WakeWordDetector):
     def __init__(self, config: WakeWordConfig):
         self.config = config
         self._model = None
+        self._wakeword_key: Optional[str] = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
     
     def _initialize(self):
-        """Initialize OpenWakeWord."""
+        """Initialize OpenWakeWord (once; reused across start/stop)."""
+        if self._model is not None:
+            return
+        
         try:
             from openwakeword import Model
         except ImportError:
@@ -165,29 +184,28 @@ class OpenWakeWordDetector(WakeWordDetector):
             wakeword_models=[self.config.openwakeword_model],
             inference_framework="onnx",
         )
+        # Only one wake word model is loaded; look its score up directly
+        self._wakeword_key = next(iter(self._model.models))
     
     def _detection_loop(self, callback: Callable[[], None]):
         """Main detection loop."""
-        import sounddevice as sd
-        
         chunk_size = 1280
+        model = self._model
+        key = self._wakeword_key
+        threshold = self.config.openwakeword_threshold
         
-        with sd.InputStream(
-            samplerate=16000,
-            channels=1,
-            dtype='int16',
-            blocksize=chunk_size,
-        ) as stream:
+        with MicReader(MicStream.shared(16000), chunk_size) as reader:
             while self._running:
-                audio_data, _ = stream.read(chunk_size)
-                audio_frame = audio_data.flatten()
-                prediction = self._model.predict(audio_frame)
+                audio_frame = reader.read()
+                if audio_frame is None:
+                    continue
                 
-                for wakeword, scores in prediction.items():
-                    if scores[-1] > self.config.openwakeword_threshold:
-                        callback()
-                        self._model.reset()
-                        break
+                # predict() returns the latest score for each loaded model
+                if model.predict(audio_frame)[key] > threshold:
+                    callback()
+                    model.reset()
+                    # Don't score the command and spoken reply queued meanwhile
+                    reader.drain()
     
     def start(self, callback: Callable[[], None]):
         """Start listening for wake word."""
@@ -207,6 +225,15 @@ class OpenWakeWordDetector(WakeWordDetector):
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
+        
+        # Clear buffered audio so a stale partial detection can't fire on restart
+        if self._model is not None:
+            self._model.reset()
+    
+    def close(self):
+        """Stop listening and release the ONNX model."""
+        self.stop()
+        self._model = None
     
     def get_name(self) -> str:
         return "OpenWakeWord"
@@ -224,13 +251,31 @@ class KeyboardWakeDetector(WakeWordDetector):
     
     def _detection_loop(self, callback: Callable[[], None]):
         """Wait for Enter key."""
-        while self._running:
-            try:
-                input()
+        # Poll stdin so stop() can end the loop; Windows consoles can't be
+        # selected on, so fall back to a blocking read there
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (ValueError, OSError, io.UnsupportedOperation):
+            selector = None
+        
+        try:
+            while self._running:
+                if selector is not None:
+                    try:
+                        if not selector.select(timeout=0.2):
+                            continue
+                    except OSError:
+                        selector.close()
+                        selector = None
+                line = sys.stdin.readline()
+                if not line:
+                    break  # EOF
                 if self._running:
                     callback()
-            except EOFError:
-                break
+        finally:
+            if selector is not None:
+                selector.close()
     
     def start(self, callback: Callable[[], None]):
         """Start listening for Enter key."""
@@ -247,6 +292,9 @@ class KeyboardWakeDetector(WakeWordDetector):
     def stop(self):
         """Stop listening."""
         self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
     
     def get_name(self) -> str:
         return "Keyboard"
@@ -260,12 +308,22 @@ WAKE_WORD_DETECTORS = {
 
 
 def get_wake_word_detector(config: WakeWordConfig) -> WakeWordDetector:
-    """Factory function to get wake word detector."""
-    detector_class = WAKE_WORD_DETECTORS.get(config.provider)
-    if detector_class is None:
+    """
+    Factory function to get wake word detector.
+    
+    Detectors are reused for identical configs, so re-arming after
+    stop()/close() doesn't rebuild the detector object.
+    """
+    provider = config.provider.lower()
+    if provider not in WAKE_WORD_DETECTORS:
         available = ", ".join(WAKE_WORD_DETECTORS.keys())
         raise ValueError(
             f"Unknown wake word provider: {config.provider}. Available: {available}"
         )
     
-    return detector_class(config)
+    return _cached_detector(provider, astuple(replace(config, provider=provider)))
+
+
+@lru_cache(maxsize=8)
+def _cached_detector(provider: str, config_fields: tuple) -> WakeWordDetector:
+    return WAKE_WORD_DETECTORS[provider](WakeWordConfig(*config_fields))
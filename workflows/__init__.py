@@ -16,6 +16,7 @@ from .base import (
 from .home_assistant import (
     HomeAssistantConfig,
     HomeAssistantClient,
+    get_default_client,
     HomeAssistantLightsWorkflow,
     HomeAssistantLockWorkflow,
     HomeAssistantClimateWorkflow,
@@ -41,6 +42,7 @@ __all__ = [
     # Home Assistant
     "HomeAssistantConfig",
     "HomeAssistantClient",
+    "get_default_client",
     "HomeAssistantLightsWorkflow",
     "HomeAssistantLockWorkflow",
     "HomeAssistantClimateWorkflow",
@@ -17,17 +17,19 @@ Example workflows are provided for common use cases.
 
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any, Callable
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+import asyncio
 import re
 
 
-class WorkflowStatus(Enum):
+class WorkflowStatus(IntEnum):
     """Status of a workflow execution."""
-    SUCCESS = "success"
-    FAILURE = "failure"
-    PARTIAL = "partial"  # Some actions succeeded
-    PENDING = "pending"  # Waiting for external response
+    SUCCESS = 0
+    FAILURE = 1
+    PARTIAL = 2  # Some actions succeeded
+    PENDING = 3  # Waiting for external response
 
 
 @dataclass
@@ -50,6 +52,20 @@ class WorkflowTrigger:
     
     # Example phrases (used for LLM context)
     examples: List[str] = field(default_factory=list)
+    
+    # All patterns combined into one case-insensitive regex, built once
+    pattern: Optional[re.Pattern] = field(init=False, repr=False, compare=False, default=None)
+    
+    # Keywords lowercased once for matching against lowercased text
+    keywords_lower: tuple = field(init=False, repr=False, compare=False, default=())
+    
+    def __post_init__(self):
+        self.keywords_lower = tuple(keyword.lower() for keyword in self.keywords)
+        if self.patterns:
+            self.pattern = re.compile(
+                "|".join(f"(?:{p})" for p in self.patterns),
+                re.IGNORECASE,
+            )
 
 
 class Workflow(ABC):
@@ -90,28 +106,45 @@ class Workflow(ABC):
         """
         pass
     
+    async def warmup(self):
+        """Open connections ahead of the first command. Optional."""
+        pass
+    
+    async def close(self):
+        """Release any connections held by this workflow. Optional."""
+        pass
+    
+    def _get_trigger(self) -> WorkflowTrigger:
+        """Return the trigger, built once per workflow instead of on every access."""
+        trigger = self.__dict__.get("_trigger")
+        if trigger is None:
+            trigger = self._trigger = self.trigger
+        return trigger
+    
     def matches(self, text: str) -> bool:
         """Check if this workflow should handle the given text."""
+        trigger = self._get_trigger()
         text_lower = text.lower()
         
         # Check keywords
-        for keyword in self.trigger.keywords:
-            if keyword.lower() in text_lower:
+        for keyword in trigger.keywords_lower:
+            if keyword in text_lower:
                 return True
         
         # Check patterns
-        for pattern in self.trigger.patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        return self._matches_pattern(text)
+    
+    def _matches_pattern(self, text: str) -> bool:
+        """Check only the trigger's regex patterns."""
+        pattern = self._get_trigger().pattern
+        return pattern is not None and pattern.search(text) is not None
     
     def get_context_for_llm(self) -> str:
         """
         Return context about this workflow for the LLM.
         This helps the LLM understand what the assistant can do.
         """
-        examples_text = "\n".join(f"  - {ex}" for ex in self.trigger.examples)
+        examples_text = "\n".join(f"  - {ex}" for ex in self._get_trigger().examples)
         return f"""
 Workflow: {self.name}
 Description: {self.description}
@@ -517,6 +550,26 @@ class TimerWorkflow(Workflow):
 # WORKFLOW MANAGER
 # =============================================================================
 
+def _compile_combined(pattern: str):
+    """
+    Compile a case-insensitive pattern, with RE2 when available.
+    
+    Falls back to re if google-re2 isn't installed or the pattern uses
+    syntax RE2 doesn't support (backreferences, lookaround).
+    """
+    try:
+        import re2
+    except ImportError:
+        re2 = None
+    
+    if re2 is not None:
+        try:
+            return re2.compile(f"(?i){pattern}")
+        except re2.error:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
 class WorkflowManager:
     """
     Manages all registered workflows.
@@ -525,15 +578,101 @@ class WorkflowManager:
     
     def __init__(self):
         self.workflows: Dict[str, Workflow] = {}
+        self._keyword_index = None  # Built lazily; False when unavailable
+        self._combined_pattern = None  # Built lazily; False when no patterns
+        
+        # Normalized utterance -> matching workflow name (None for no match).
+        # Names rather than objects, so a stale entry can't outlive unregister.
+        self._match_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._match_cache_size = 128
     
     def register(self, workflow: Workflow):
         """Register a new workflow."""
         self.workflows[workflow.name] = workflow
+        self._invalidate()
     
     def unregister(self, name: str):
         """Unregister a workflow by name."""
         if name in self.workflows:
             del self.workflows[name]
+            self._invalidate()
+    
+    def _invalidate(self):
+        """Drop matching structures built from the registered workflows."""
+        self._keyword_index = None
+        self._combined_pattern = None
+        self._match_cache.clear()
+    
+    def _get_keyword_index(self):
+        """
+        Build an Aho-Corasick automaton over every workflow keyword.
+        
+        One pass over the text then finds the keyword hits of all
+        workflows at once. Returns None if pyahocorasick isn't installed.
+        """
+        if self._keyword_index is None:
+            try:
+                import ahocorasick
+            except ImportError:
+                self._keyword_index = False
+                return None
+            
+            automaton = ahocorasick.Automaton()
+            for name, workflow in self.workflows.items():
+                for keyword in workflow._get_trigger().keywords_lower:
+                    names = automaton.get(keyword, None)
+                    if names is None:
+                        names = set()
+                        automaton.add_word(keyword, names)
+                    names.add(name)
+            
+            if len(automaton) == 0:
+                self._keyword_index = False
+                return None
+            automaton.make_automaton()
+            self._keyword_index = automaton
+        
+        return self._keyword_index or None
+    
+    def _get_combined_pattern(self):
+        """
+        Fuse every workflow's patterns into one alternation.
+        
+        A single search tells whether any pattern matches at all, so the
+        common no-match case skips the per-workflow regex checks. Patterns
+        shared by several workflows (e.g. the built-in and Home Assistant
+        thermostat triggers) appear only once. Compiled with RE2 when
+        google-re2 is installed, which matches in linear time with no
+        backtracking; otherwise with re.
+        """
+        if self._combined_pattern is None:
+            # dict.fromkeys drops duplicates but keeps the first occurrence order
+            patterns = list(dict.fromkeys(
+                pattern
+                for workflow in self.workflows.values()
+                for pattern in workflow._get_trigger().patterns
+            ))
+            if patterns:
+                self._combined_pattern = _compile_combined(
+                    "|".join(f"(?:{p})" for p in patterns)
+                )
+            else:
+                self._combined_pattern = False
+        return self._combined_pattern or None
+    
+    def _keyword_hits(self, text_lower: str) -> set:
+        """Names of the workflows with a keyword in the lowercased text."""
+        index = self._get_keyword_index()
+        if index is None:
+            return {
+                name for name, workflow in self.workflows.items()
+                if any(k in text_lower for k in workflow._get_trigger().keywords_lower)
+            }
+        
+        hits = set()
+        for _, names in index.iter(text_lower):
+            hits |= names
+        return hits
     
     def get_workflow(self, name: str) -> Optional[Workflow]:
         """Get a workflow by name."""
@@ -541,8 +680,33 @@ class WorkflowManager:
     
     def find_matching_workflow(self, text: str) -> Optional[Workflow]:
         """Find a workflow that matches the given text."""
-        for workflow in self.workflows.values():
-            if workflow.matches(text):
+        # Matching is case-insensitive, so repeats differing only in case
+        # or surrounding whitespace share a cache entry
+        text_lower = text.lower()
+        key = text_lower.strip()
+        if len(key) > 128:
+            return self._find_matching_workflow(text, text_lower)  # Long one-offs aren't worth keeping
+        if key in self._match_cache:
+            self._match_cache.move_to_end(key)
+            name = self._match_cache[key]
+            return self.workflows.get(name) if name is not None else None
+        
+        workflow = self._find_matching_workflow(text, text_lower)
+        self._match_cache[key] = workflow.name if workflow is not None else None
+        if len(self._match_cache) > self._match_cache_size:
+            self._match_cache.popitem(last=False)
+        return workflow
+    
+    def _find_matching_workflow(self, text: str, text_lower: str) -> Optional[Workflow]:
+        keyword_hits = self._keyword_hits(text_lower)
+        combined = self._get_combined_pattern()
+        pattern_hit = combined is not None and combined.search(text) is not None
+        if not keyword_hits and not pattern_hit:
+            return None
+        
+        # Keep registration order so the first matching workflow still wins
+        for name, workflow in self.workflows.items():
+            if name in keyword_hits or (pattern_hit and workflow._matches_pattern(text)):
                 return workflow
         return None
     
@@ -557,6 +721,26 @@ class WorkflowManager:
     def list_workflows(self) -> List[str]:
         """List all registered workflow names."""
         return list(self.workflows.keys())
+    
+    async def warmup(self, timeout: float = 10.0):
+        """
+        Warm up every registered workflow; failures are reported, not raised.
+        
+        Args:
+            timeout: Seconds to allow each workflow before giving up on it
+        """
+        for workflow in self.workflows.values():
+            try:
+                await asyncio.wait_for(workflow.warmup(), timeout)
+            except asyncio.TimeoutError:
+                print(f"Warm-up timed out for workflow '{workflow.name}'")
+            except Exception as e:
+                print(f"Warm-up failed for workflow '{workflow.name}': {e}")
+    
+    async def close(self):
+        """Close every registered workflow."""
+        for workflow in self.workflows.values():
+            await workflow.close()
 
 
 def create_default_workflow_manager() -> WorkflowManager:
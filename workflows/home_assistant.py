@@ -15,8 +15,12 @@ Configuration:
 - Set HASS_TOKEN environment variable (your long-lived access token)
 """
 
+import asyncio
+import json
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple, Union
 from dataclasses import dataclass
 
 from .base import Workflow, WorkflowResult, WorkflowStatus, WorkflowTrigger
@@ -27,6 +31,7 @@ class HomeAssistantConfig:
     """Configuration for Home Assistant connection."""
     url: str = ""  # e.g., http://homeassistant.local:8123
     token: str = ""  # Long-lived access token
+    state_cache_ttl: float = 3.0  # Seconds to reuse a fetched entity state (0 disables)
     
     @classmethod
     def from_env(cls) -> "HomeAssistantConfig":
@@ -39,8 +44,13 @@ class HomeAssistantConfig:
 class HomeAssistantClient:
     """
     Client for interacting with Home Assistant REST API.
+    
+    One aiohttp session is kept open and reused, so consecutive calls share
+    pooled keep-alive connections instead of reconnecting each time.
     """
     
+    WARMUP_TIMEOUT = 5.0  # Seconds to wait for the warm-up ping
+    
     def __init__(self, config: HomeAssistantConfig):
         self.config = config
         self.base_url = config.url.rstrip("/")
@@ -48,57 +58,239 @@ class HomeAssistantClient:
             "Authorization": f"Bearer {config.token}",
             "Content-Type": "application/json",
         }
+        self._session = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._warmed_session = None
+        self._json_loads = json.loads
+        
+        # entity_id -> (expires_at, state); follow-up questions hit this
+        self._state_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    async def _get_session(self):
+        """Return the shared session, creating it on first use."""
+        # Sessions are bound to the event loop that created them
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # Imported here so aiohttp stays optional, but only when a
+            # session is built rather than on every request
+            import aiohttp
+            
+            if self._session is not None and not self._session.closed:
+                if self._session_loop is loop:
+                    await self._session.close()
+                else:
+                    self._close_on_own_loop(self._session, self._session_loop)
+            
+            # orjson encodes and decodes several times faster than json,
+            # which matters most for large get_states() responses
+            kwargs = {}
+            try:
+                import orjson
+                kwargs["json_serialize"] = lambda obj: orjson.dumps(obj).decode()
+                self._json_loads = orjson.loads
+            except ImportError:
+                self._json_loads = json.loads
+            
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+                **kwargs,
+            )
+            self._session_loop = loop
+        return self._session
+    
+    @staticmethod
+    def _close_on_own_loop(session, session_loop: asyncio.AbstractEventLoop):
+        """Close a session belonging to another event loop, on that loop."""
+        if session_loop.is_closed():
+            # Nothing can run on a closed loop any more, so its connections
+            # can't be shut down cleanly; detach so the session counts as closed
+            session.detach()
+        else:
+            # Runs as soon as that loop is running, or next time it runs
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+    
+    async def warmup(self):
+        """
+        Ping the API so the first command finds DNS resolved and a
+        connection already open in the pool.
+        """
+        import aiohttp
+        
+        # Workflows sharing this client each ask for a warm-up; ping once per
+        # session, and don't retry a failed ping for every one of them
+        session = await self._get_session()
+        if self._warmed_session is session:
+            return
+        self._warmed_session = session
+        
+        # Fail fast rather than hold up startup when Home Assistant is unreachable
+        timeout = aiohttp.ClientTimeout(total=self.WARMUP_TIMEOUT)
+        async with session.get(f"{self.base_url}/api/", timeout=timeout) as resp:
+            resp.raise_for_status()
+    
+    async def close(self):
+        """Close the shared session. Safe to call more than once."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        self._warmed_session = None
     
     async def call_service(
         self,
         domain: str,
         service: str,
-        entity_id: Optional[str] = None,
+        entity_id: Optional[Union[str, List[str]]] = None,
         data: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
+        parse_response: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Call a Home Assistant service.
         
         Args:
             domain: Service domain (e.g., "light", "switch", "lock")
             service: Service name (e.g., "turn_on", "turn_off", "lock")
-            entity_id: Target entity (e.g., "light.living_room")
+            entity_id: Target entity (e.g., "light.living_room"), or a list
+                of entities to act on in one request
             data: Additional service data
+            parse_response: Decode the returned states; pass False when
+                only success matters to skip the JSON decode
+            
+        Returns:
+            The states Home Assistant changed, or None if not parsed
         """
-        import aiohttp
-        
         url = f"{self.base_url}/api/services/{domain}/{service}"
         
         payload = data or {}
         if entity_id:
             payload["entity_id"] = entity_id
+        self._invalidate_states(payload.get("entity_id"))
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=self.headers) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        session = await self._get_session()
+        async with session.post(url, json=payload) as resp:
+            resp.raise_for_status()
+            if not parse_response:
+                # Still drain the body so the connection returns to the pool
+                await resp.read()
+                return None
+            return await resp.json(loads=self._json_loads)
     
     async def get_states(self) -> List[Dict[str, Any]]:
         """Get all entity states."""
-        import aiohttp
-        
         url = f"{self.base_url}/api/states"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        session = await self._get_session()
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            return await resp.json(loads=self._json_loads)
     
     async def get_state(self, entity_id: str) -> Dict[str, Any]:
-        """Get state of a specific entity."""
-        import aiohttp
+        """
+        Get state of a specific entity.
+        
+        States are reused for config.state_cache_ttl seconds, so rapid
+        follow-up questions don't each cost a round trip.
+        """
+        cached = self._state_cache.get(entity_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
         
         url = f"{self.base_url}/api/states/{entity_id}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        session = await self._get_session()
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            state = await resp.json(loads=self._json_loads)
+        
+        if self.config.state_cache_ttl > 0:
+            self._state_cache[entity_id] = (time.monotonic() + self.config.state_cache_ttl, state)
+        return state
+    
+    async def refresh_state_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch every entity state in one request.
+        
+        Returns:
+            States keyed by entity_id; also stored in the state cache
+        """
+        index = {state["entity_id"]: state for state in await self.get_states()}
+        
+        if self.config.state_cache_ttl > 0:
+            expires_at = time.monotonic() + self.config.state_cache_ttl
+            self._state_cache.update(
+                (entity_id, (expires_at, state)) for entity_id, state in index.items()
+            )
+        return index
+    
+    async def get_states_for(self, entity_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get the states of several entities.
+        
+        Fresh cached states are reused and the rest come from one bulk
+        get_states() call instead of one request per entity.
+        
+        Returns:
+            States keyed by entity_id, None for entities Home Assistant doesn't know
+        """
+        now = time.monotonic()
+        states: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing = []
+        for entity_id in entity_ids:
+            cached = self._state_cache.get(entity_id)
+            if cached is not None and cached[0] > now:
+                states[entity_id] = cached[1]
+            else:
+                missing.append(entity_id)
+        
+        if missing:
+            index = await self.refresh_state_index()
+            for entity_id in missing:
+                states[entity_id] = index.get(entity_id)
+        return states
+    
+    def _invalidate_states(self, entity_id: Optional[Union[str, List[str]]]):
+        """Forget cached states a service call may have changed."""
+        if not self._state_cache:
+            return
+        if entity_id is None or entity_id == "all":
+            self._state_cache.clear()
+        elif isinstance(entity_id, str):
+            self._state_cache.pop(entity_id, None)
+        else:
+            for entity in entity_id:
+                self._state_cache.pop(entity, None)
+
+
+_default_clients: Dict[Tuple[str, str], HomeAssistantClient] = {}
+_default_clients_lock = threading.Lock()
+
+
+def get_default_client() -> Optional[HomeAssistantClient]:
+    """
+    Get the client configured from HASS_URL/HASS_TOKEN, shared by all
+    Home Assistant workflows so they use one connection pool and state cache.
+    
+    Returns:
+        The shared client, or None if HASS_TOKEN isn't set
+    """
+    config = HomeAssistantConfig.from_env()
+    if not config.token:
+        return None
+    
+    key = (config.url, config.token)
+    with _default_clients_lock:
+        client = _default_clients.get(key)
+        if client is None:
+            client = _default_clients[key] = HomeAssistantClient(config)
+        return client
+
+
+def _join_names(names: List[str]) -> str:
+    """Join names for speech: "front, back and garage"."""
+    if len(names) == 1:
+        return names[0]
+    return f"{', '.join(names[:-1])} and {names[-1]}"
 
 
 class HomeAssistantLightsWorkflow(Workflow):
@@ -123,12 +315,17 @@ class HomeAssistantLightsWorkflow(Workflow):
             "all": "all",  # Special case
         }
     
+    async def warmup(self):
+        if self.client is not None:
+            await self.client.warmup()
+    
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+    
     def _create_default_client(self) -> Optional[HomeAssistantClient]:
-        """Create client from environment variables."""
-        config = HomeAssistantConfig.from_env()
-        if config.token:
-            return HomeAssistantClient(config)
-        return None
+        """Use the shared client configured from environment variables."""
+        return get_default_client()
     
     @property
     def name(self) -> str:
@@ -167,11 +364,12 @@ class HomeAssistantLightsWorkflow(Workflow):
         room = entities.get("room", "living room").lower()
         brightness = entities.get("brightness")
         
+        rooms = [r.lower() for r in entities.get("rooms", [room])]
+        if len(rooms) > 1 and "all" not in rooms:
+            return await self._execute_rooms(action, rooms, brightness)
+        
         # Get entity ID
-        entity_id = self.room_mapping.get(room)
-        if entity_id is None:
-            # Try to find a matching entity
-            entity_id = f"light.{room.replace(' ', '_')}"
+        entity_id = self._light_entity(room)
         
         try:
             if action == "on":
@@ -180,9 +378,9 @@ class HomeAssistantLightsWorkflow(Workflow):
                     service_data["brightness_pct"] = brightness
                 
                 if entity_id == "all":
-                    await self.client.call_service("light", "turn_on", data={"entity_id": "all"})
+                    await self.client.call_service("light", "turn_on", data={"entity_id": "all"}, parse_response=False)
                 else:
-                    await self.client.call_service("light", "turn_on", entity_id, service_data)
+                    await self.client.call_service("light", "turn_on", entity_id, service_data, parse_response=False)
                 
                 message = f"I've illuminated the {room}, sir."
                 if brightness:
@@ -190,22 +388,23 @@ class HomeAssistantLightsWorkflow(Workflow):
             
             elif action == "off":
                 if entity_id == "all":
-                    await self.client.call_service("light", "turn_off", data={"entity_id": "all"})
+                    await self.client.call_service("light", "turn_off", data={"entity_id": "all"}, parse_response=False)
                 else:
-                    await self.client.call_service("light", "turn_off", entity_id)
+                    await self.client.call_service("light", "turn_off", entity_id, parse_response=False)
                 
                 message = f"The {room} is now dark, sir. Do try not to stub your toe."
             
             elif action == "dim" and brightness is not None:
                 await self.client.call_service(
                     "light", "turn_on", entity_id,
-                    {"brightness_pct": brightness}
+                    {"brightness_pct": brightness},
+                    parse_response=False,
                 )
                 message = f"I've dimmed the {room} lights to {brightness}%, sir."
             
             else:
                 # Toggle
-                await self.client.call_service("light", "toggle", entity_id)
+                await self.client.call_service("light", "toggle", entity_id, parse_response=False)
                 message = f"I've toggled the {room} lights, sir."
             
             return WorkflowResult(
@@ -220,6 +419,52 @@ class HomeAssistantLightsWorkflow(Workflow):
                 message=f"I encountered difficulty with the lights, sir. The error was: {str(e)}",
                 error=str(e)
             )
+    
+    def _light_entity(self, room: str) -> str:
+        """Map a room name to its light entity ID."""
+        entity_id = self.room_mapping.get(room)
+        if entity_id is None:
+            # Try to find a matching entity
+            entity_id = f"light.{room.replace(' ', '_')}"
+        return entity_id
+    
+    async def _execute_rooms(
+        self, action: str, rooms: List[str], brightness: Optional[int]
+    ) -> WorkflowResult:
+        """Apply one action to several rooms with a single service call."""
+        entity_ids = [self._light_entity(room) for room in rooms]
+        names = _join_names(rooms)
+        
+        try:
+            if action == "on":
+                data = {"brightness_pct": brightness} if brightness else None
+                await self.client.call_service("light", "turn_on", entity_ids, data, parse_response=False)
+                message = f"I've illuminated the {names}, sir."
+            elif action == "off":
+                await self.client.call_service("light", "turn_off", entity_ids, parse_response=False)
+                message = f"The {names} are now dark, sir. Do try not to stub your toe."
+            elif action == "dim" and brightness is not None:
+                await self.client.call_service(
+                    "light", "turn_on", entity_ids, {"brightness_pct": brightness},
+                    parse_response=False,
+                )
+                message = f"I've dimmed the {names} lights to {brightness}%, sir."
+            else:
+                await self.client.call_service("light", "toggle", entity_ids, parse_response=False)
+                message = f"I've toggled the {names} lights, sir."
+            
+            return WorkflowResult(
+                status=WorkflowStatus.SUCCESS,
+                message=message,
+                data={"rooms": rooms, "action": action, "brightness": brightness}
+            )
+        
+        except Exception as e:
+            return WorkflowResult(
+                status=WorkflowStatus.FAILURE,
+                message=f"I encountered difficulty with the lights, sir. The error was: {str(e)}",
+                error=str(e)
+            )
 
 
 class HomeAssistantLockWorkflow(Workflow):
@@ -236,11 +481,16 @@ class HomeAssistantLockWorkflow(Workflow):
             "side": "lock.side_door",
         }
     
+    async def warmup(self):
+        if self.client is not None:
+            await self.client.warmup()
+    
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+    
     def _create_default_client(self) -> Optional[HomeAssistantClient]:
-        config = HomeAssistantConfig.from_env()
-        if config.token:
-            return HomeAssistantClient(config)
-        return None
+        return get_default_client()
     
     @property
     def name(self) -> str:
@@ -278,15 +528,21 @@ class HomeAssistantLockWorkflow(Workflow):
         action = entities.get("action", "lock")
         door = entities.get("door", "front").lower()
         
+        doors = [d.lower() for d in entities.get("doors", [door])]
+        if "all" in doors:
+            doors = list(self.lock_mapping)
+        if len(doors) > 1:
+            return await self._execute_doors(action, doors)
+        
         entity_id = self.lock_mapping.get(door, f"lock.{door}_door")
         
         try:
             if action == "lock":
-                await self.client.call_service("lock", "lock", entity_id)
+                await self.client.call_service("lock", "lock", entity_id, parse_response=False)
                 message = f"The {door} door is now secured, sir."
             
             elif action == "unlock":
-                await self.client.call_service("lock", "unlock", entity_id)
+                await self.client.call_service("lock", "unlock", entity_id, parse_response=False)
                 message = f"I've unlocked the {door} door, sir. Do exercise appropriate caution."
             
             elif action == "check":
@@ -312,6 +568,72 @@ class HomeAssistantLockWorkflow(Workflow):
                 message=f"There was a complication with the door lock, sir.",
                 error=str(e)
             )
+    
+    async def _execute_doors(self, action: str, doors: List[str]) -> WorkflowResult:
+        """
+        Act on several doors at once.
+        
+        Lock and unlock go out as one service call, and status checks read
+        every door from a single bulk state fetch.
+        """
+        entity_ids = [self.lock_mapping.get(d, f"lock.{d}_door") for d in doors]
+        names = _join_names(doors)
+        
+        try:
+            if action == "check":
+                states = await self.client.get_states_for(entity_ids)
+                missing = [d for d, e in zip(doors, entity_ids) if states[e] is None]
+                if len(missing) == len(doors):
+                    return WorkflowResult(
+                        status=WorkflowStatus.FAILURE,
+                        message="I could not find any of those locks, sir.",
+                        error=f"Unknown locks: {', '.join(missing)}",
+                    )
+                
+                unlocked = [
+                    d for d, e in zip(doors, entity_ids)
+                    if states[e] is not None and states[e].get("state") != "locked"
+                ]
+                if unlocked:
+                    message = f"The {_join_names(unlocked)} {'door is' if len(unlocked) == 1 else 'doors are'} currently unlocked, sir. Shall I secure {'it' if len(unlocked) == 1 else 'them'}?"
+                elif missing:
+                    found = [d for d in doors if d not in missing]
+                    message = f"The {_join_names(found)} {'door is' if len(found) == 1 else 'doors are'} securely locked, sir."
+                else:
+                    message = "Every door is securely locked, sir."
+                if missing:
+                    message += f" I could not find the {_join_names(missing)} lock{'s' if len(missing) > 1 else ''}."
+                
+                return WorkflowResult(
+                    status=WorkflowStatus.PARTIAL if missing else WorkflowStatus.SUCCESS,
+                    message=message,
+                    data={"doors": doors, "action": action, "unlocked": unlocked},
+                    error=f"Unknown locks: {', '.join(missing)}" if missing else None,
+                )
+            
+            elif action == "lock":
+                await self.client.call_service("lock", "lock", entity_ids, parse_response=False)
+                message = f"The {names} doors are now secured, sir."
+            
+            elif action == "unlock":
+                await self.client.call_service("lock", "unlock", entity_ids, parse_response=False)
+                message = f"I've unlocked the {names} doors, sir. Do exercise appropriate caution."
+            
+            else:
+                message = f"Lock action completed, sir."
+            
+            return WorkflowResult(
+                status=WorkflowStatus.SUCCESS,
+                message=message,
+                data={"doors": doors, "action": action}
+            )
+        
+        except Exception as e:
+            return WorkflowResult(
+                status=WorkflowStatus.FAILURE,
+                message=f"There was a complication with the door locks, sir.",
+                error=str(e)
+            )
 
 
 class HomeAssistantClimateWorkflow(Workflow):
@@ -321,11 +643,16 @@ class HomeAssistantClimateWorkflow(Workflow):
         self.client = client or self._create_default_client()
         self.climate_entity = climate_entity
     
+    async def warmup(self):
+        if self.client is not None:
+            await self.client.warmup()
+    
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+    
     def _create_default_client(self) -> Optional[HomeAssistantClient]:
-        config = HomeAssistantConfig.from_env()
-        if config.token:
-            return HomeAssistantClient(config)
-        return None
+        return get_default_client()
     
     @property
     def name(self) -> str:
@@ -368,7 +695,8 @@ class HomeAssistantClimateWorkflow(Workflow):
                 await self.client.call_service(
                     "climate", "set_temperature",
                     self.climate_entity,
-                    {"temperature": temperature}
+                    {"temperature": temperature},
+                    parse_response=False,
                 )
                 message = f"I've set the temperature to {temperature} degrees, sir. Comfort is en route."
             
@@ -376,7 +704,8 @@ class HomeAssistantClimateWorkflow(Workflow):
                 await self.client.call_service(
                     "climate", "set_hvac_mode",
                     self.climate_entity,
-                    {"hvac_mode": mode}
+                    {"hvac_mode": mode},
+                    parse_response=False,
                 )
                 message = f"The climate system is now in {mode} mode, sir."
             